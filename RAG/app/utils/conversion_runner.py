@@ -0,0 +1,214 @@
+"""
+Multi-process PDF-to-markdown conversion with a persistent work queue.
+
+Each worker process holds its own warm MarkerSession. The queue state
+(pending / in_progress / done / failed) is written to a JSON file after every
+transition, so an interrupted run picks up exactly where it stopped.
+"""
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from app.utils.page_parallel import count_pdf_pages
+
+if TYPE_CHECKING:
+    from app.utils.text_extraction import ConversionTask, MarkerSession
+
+PENDING = "pending"
+IN_PROGRESS = "in_progress"
+DONE = "done"
+FAILED = "failed"
+
+
+def format_duration(seconds: float) -> str:
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+class ConversionQueue:
+    """Conversion state for a set of PDFs, persisted as JSON"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries = {}  # type: Dict[str, Dict[str, Any]]
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+
+    def save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def add(self, tasks: List['ConversionTask']) -> int:
+        """
+        Register new tasks as pending; returns how many were added.
+
+        Entries not converted yet take the options (output path,
+        extract_images, stream) of this run; finished ones keep theirs.
+        """
+        added = 0
+        for task in tasks:
+            entry = self.entries.get(task.pdf_path)
+            if entry is not None:
+                # Output was removed since the last run, convert again
+                if entry['status'] == DONE and not os.path.exists(entry['output_md_path']):
+                    entry['status'] = PENDING
+                options = asdict(task)
+                if entry['status'] != DONE:
+                    entry.update(options)
+                elif any(entry.get(name) != value for name, value in options.items()):
+                    print(f"⚠️ {task.pdf_path} was already converted with other options, "
+                          f"delete {entry['output_md_path']} to convert it again")
+                continue
+            self.entries[task.pdf_path] = {
+                **asdict(task),
+                'status': PENDING,
+                'pages': count_pdf_pages(task.pdf_path),
+                'attempts': 0,
+                'error': None,
+                'seconds': None,
+            }
+            added += 1
+        self.save()
+        return added
+
+    def recover(self, retry_failed: bool = False) -> int:
+        """Requeue tasks left in progress by an interrupted run (and failed ones if asked)"""
+        requeued = 0
+        for entry in self.entries.values():
+            if entry['status'] == IN_PROGRESS or (retry_failed and entry['status'] == FAILED):
+                entry['status'] = PENDING
+                requeued += 1
+        self.save()
+        return requeued
+
+    def mark(self, pdf_path: str, status: str, **fields):
+        entry = self.entries[pdf_path]
+        entry['status'] = status
+        entry.update(fields)
+        self.save()
+
+    def with_status(self, status: str) -> List[Dict[str, Any]]:
+        return [entry for entry in self.entries.values() if entry['status'] == status]
+
+    def counts(self) -> Dict[str, int]:
+        counts = {PENDING: 0, IN_PROGRESS: 0, DONE: 0, FAILED: 0}
+        for entry in self.entries.values():
+            counts[entry['status']] += 1
+        return counts
+
+
+_worker_session = None  # type: Optional[MarkerSession]
+
+
+def _init_worker(ocr_cache_path: Optional[str], max_memory_mb: Optional[float]):
+    """Load the models once per worker process (the parent never imports Marker)"""
+    global _worker_session
+    from app.utils.text_extraction import MarkerSession
+    _worker_session = MarkerSession(ocr_cache_path=ocr_cache_path, max_memory_mb=max_memory_mb)
+    _worker_session.converter
+    _worker_session.reader
+
+
+def _convert_in_worker(task: Dict[str, Any]) -> Dict[str, Any]:
+    start = time.time()
+    try:
+        if task.get('stream'):
+            _worker_session.convert_streaming(task['pdf_path'], task['output_md_path'],
+                                              extract_images=task['extract_images'])
+        else:
+            _worker_session.convert(task['pdf_path'], task['output_md_path'], extract_images=task['extract_images'])
+        return {'ok': True, 'error': None, 'seconds': time.time() - start}
+    except Exception as e:
+        return {'ok': False, 'error': str(e), 'seconds': time.time() - start}
+
+
+class ConversionRunner:
+    """
+    Converts queued PDFs with N worker processes, each holding a warm MarkerSession.
+
+    Usage:
+        runner = ConversionRunner("output/_conversion_queue.json", workers=4)
+        runner.run(tasks)
+    """
+
+    def __init__(self, queue_path: str, workers: int = 1, retry_failed: bool = False,
+                 ocr_cache_path: Optional[str] = None, max_memory_mb: Optional[float] = None):
+        self.queue = ConversionQueue(queue_path)
+        self.workers = max(1, workers)
+        self.retry_failed = retry_failed
+        self.ocr_cache_path = ocr_cache_path
+        self.max_memory_mb = max_memory_mb
+
+    def run(self, tasks: List['ConversionTask']) -> Dict[str, int]:
+        """Queue the given tasks and convert everything pending; returns final status counts"""
+        added = self.queue.add(tasks)
+        requeued = self.queue.recover(retry_failed=self.retry_failed)
+        pending = self.queue.with_status(PENDING)
+        print(f"📋 Queue: {added} new, {requeued} requeued, {len(pending)} pending -> {self.queue.path}")
+        if not pending:
+            return self.queue.counts()
+
+        total_files = len(pending)
+        total_pages = sum(entry['pages'] or 0 for entry in pending)
+        pages_done = 0
+        files_done = 0
+        start = time.time()
+        print(f"🚀 Converting {len(pending)} files ({total_pages} pages) with {self.workers} worker(s)")
+
+        # Marker and EasyOCR hold torch state that does not survive fork
+        context = multiprocessing.get_context("spawn")
+        running = {}
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers, mp_context=context,
+                                     initializer=_init_worker, initargs=(self.ocr_cache_path, self.max_memory_mb)) as executor:
+                while pending or running:
+                    # Keep exactly one task per worker in flight so the queue state stays accurate
+                    while pending and len(running) < self.workers:
+                        entry = pending.pop(0)
+                        self.queue.mark(entry['pdf_path'], IN_PROGRESS, attempts=entry['attempts'] + 1)
+                        running[executor.submit(_convert_in_worker, entry)] = entry
+
+                    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        # Raises BrokenProcessPool if the worker died; the entry must still be in
+                        # `running` then, so it is marked failed below instead of left in progress
+                        result = future.result()
+                        entry = running.pop(future)
+                        files_done += 1
+                        pages_done += entry['pages'] or 0
+                        if result['ok']:
+                            self.queue.mark(entry['pdf_path'], DONE, error=None, seconds=round(result['seconds'], 2))
+                        else:
+                            self.queue.mark(entry['pdf_path'], FAILED, error=result['error'],
+                                            seconds=round(result['seconds'], 2))
+                        self._report(entry, result, files_done, total_files, pages_done, total_pages, start)
+        except BrokenProcessPool as e:
+            # A worker died (usually OOM); do not let the same files kill the next run forever
+            for entry in running.values():
+                self.queue.mark(entry['pdf_path'], FAILED, error=f"worker crashed: {e}")
+            print(f"❌ Worker pool crashed: {e}")
+
+        counts = self.queue.counts()
+        elapsed = time.time() - start
+        print(f"\n✅ Finished in {format_duration(elapsed)}: {counts[DONE]} done, {counts[FAILED]} failed, "
+              f"{counts[PENDING]} pending")
+        return counts
+
+    def _report(self, entry, result, files_done, total_files, pages_done, total_pages, start):
+        elapsed = time.time() - start
+        pages_per_second = pages_done / elapsed if elapsed > 0 else 0.0
+        remaining_pages = total_pages - pages_done
+        eta = format_duration(remaining_pages / pages_per_second) if pages_per_second > 0 else "--:--:--"
+        status = "✓" if result['ok'] else f"✗ {result['error']}"
+        print(f"[{files_done}/{total_files}] "
+              f"{os.path.basename(entry['pdf_path'])} {status} ({entry['pages'] or '?'} pages, {result['seconds']:.1f}s) | "
+              f"{pages_per_second:.2f} pages/s | ETA {eta}")
@@ -1,12 +1,13 @@
-
-
+import argparse
 import os
 
-from app.utils.text_extraction import pdf_to_markdown_ocr_inline
+from app.utils.conversion_runner import ConversionRunner
+from app.utils.text_extraction import ConversionTask, MarkerSession
 
 
-def loop_through_pdfs(main_folder, func):
-   
+def collect_pdf_tasks(main_folder, stream=False):
+    """Build a ConversionTask for every PDF under main_folder that has no markdown output yet"""
+    tasks = []
     for root, dirs, files in os.walk(main_folder):
         for file in files:
             if file.lower().endswith(".pdf"):
@@ -22,13 +23,64 @@ def loop_through_pdfs(main_folder, func):
                     output_filepath = os.path.join(output_dir, f"{os.path.splitext(file)[0]}.md")
 
                     if not os.path.exists(output_filepath):
-                        print(f"Processing: {file_path} -> {output_filepath}")
                         remove_images=True
                         if relative_dir =="datasheets":
                             remove_images=False
-                        
-                        func(file_path, output_filepath,extract_images=remove_images)
-                
 
-main_folder = "/code/app/native_pdf_data"  # <-- replace this
-loop_through_pdfs(main_folder, pdf_to_markdown_ocr_inline)
+                        tasks.append(ConversionTask(file_path, output_filepath, extract_images=remove_images, stream=stream))
+    return tasks
+
+
+def loop_through_pdfs(main_folder, session=None):
+    """Convert every pending PDF under main_folder, loading the models only once"""
+    tasks = collect_pdf_tasks(main_folder)
+    if not tasks:
+        print("Nothing to convert")
+        return []
+    session = session or MarkerSession()
+    return session.convert_many(tasks)
+
+
+def parse_arguments():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Convert PDFs to markdown with Marker + EasyOCR")
+    parser.add_argument(
+        '--main-folder',
+        type=str,
+        default='/code/app/native_pdf_data',
+        help='Folder containing the PDFs (default: /code/app/native_pdf_data)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Number of worker processes, each loading its own models (default: 1)'
+    )
+    parser.add_argument(
+        '--retry-failed',
+        action='store_true',
+        help='Retry files that failed in a previous run'
+    )
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Convert a few pages at a time and write them as they complete (for very large PDFs)'
+    )
+    parser.add_argument(
+        '--max-memory-mb',
+        type=float,
+        default=os.environ.get('MARKER_MAX_MEMORY_MB'),
+        help='RSS threshold per worker in streaming mode, checked between steps: above it the step size is '
+             'halved, and the file is aborted once at one page per step '
+             '(default: $MARKER_MAX_MEMORY_MB, unset = no limit)'
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_arguments()
+    queue_path = os.path.join(args.main_folder, "output", "_conversion_queue.json")
+    ocr_cache_path = os.path.join(args.main_folder, "output", "_ocr_cache.json")
+    runner = ConversionRunner(queue_path, workers=args.workers, retry_failed=args.retry_failed,
+                              ocr_cache_path=ocr_cache_path, max_memory_mb=args.max_memory_mb)
+    runner.run(collect_pdf_tasks(args.main_folder, stream=args.stream))
@@ -0,0 +1,148 @@
+"""
+OCR stage for images extracted by Marker.
+
+Datasheets repeat the same logos, icons and certification badges on nearly
+every page and document, so images are content-hashed first: each distinct
+image is OCR'd once, results are kept in a persistent hash -> text cache, and
+the remaining images are sent to EasyOCR in batches. Images that obviously
+contain no text are skipped before OCR.
+
+The key is a SHA-256 of the decoded pixels rather than a perceptual hash: a
+64-bit pHash also matches images that only look alike (the same badge with a
+different part number), and a cache hit would return the other image's text.
+"""
+import hashlib
+import json
+import os
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+from PIL import Image
+
+
+def content_hash(image: Image.Image) -> str:
+    """SHA-256 of an image's mode, size and pixel data as a hex string"""
+    digest = hashlib.sha256(f"{image.mode}:{image.width}x{image.height}:".encode('ascii'))
+    digest.update(image.tobytes())
+    return digest.hexdigest()
+
+
+def is_probably_textless(image: Image.Image, min_width: int = 24, min_height: int = 12,
+                         min_std: float = 6.0, min_edge_ratio: float = 0.004) -> bool:
+    """
+    Cheap check for images that cannot contain readable text:
+    too small, (near) uniform, or without the sharp transitions glyphs produce.
+    """
+    width, height = image.size
+    if width < min_width or height < min_height:
+        return True
+    gray = np.asarray(image.convert('L'), dtype=np.int16)
+    if gray.std() < min_std:
+        return True
+    edges = np.abs(np.diff(gray, axis=1)) > 64
+    return bool(edges.mean() < min_edge_ratio)
+
+
+class OCRCache:
+    """Persistent content-hash -> raw OCR text mapping, shared across documents"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.entries = {}  # type: Dict[str, str]
+        self._dirty = False
+        if path and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+
+    def get(self, key: str) -> Optional[str]:
+        return self.entries.get(key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.entries
+
+    def set(self, key: str, text: str):
+        self.entries[key] = text
+        self._dirty = True
+
+    def save(self):
+        if not self.path or not self._dirty:
+            return
+        # Other worker processes may have added entries since we loaded
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                on_disk = json.load(f)
+            on_disk.update(self.entries)
+            self.entries = on_disk
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+
+class ImageOCRStage:
+    """
+    Deduplicated, batched OCR over a document's images.
+
+    Args:
+        reader_factory: Callable returning an easyocr.Reader (only called if OCR is needed)
+        cache: OCRCache to read from and fill
+        text_filter: Applied to the raw OCR text of each image
+        batch_size: Number of same-sized images sent to EasyOCR at once
+    """
+
+    def __init__(self, reader_factory: Callable[[], Any], cache: Optional[OCRCache] = None,
+                 text_filter: Optional[Callable[[str], str]] = None, batch_size: int = 8):
+        self.reader_factory = reader_factory
+        self.cache = cache or OCRCache()
+        self.text_filter = text_filter or (lambda text: text)
+        self.batch_size = batch_size
+
+    def _ocr(self, images: List[Image.Image]) -> List[str]:
+        """OCR images, batching those with identical sizes"""
+        reader = self.reader_factory()
+        texts = [''] * len(images)
+        by_shape = {}  # type: Dict[tuple, List[int]]
+        for i, image in enumerate(images):
+            by_shape.setdefault((image.size, image.mode), []).append(i)
+
+        for indices in by_shape.values():
+            for start in range(0, len(indices), self.batch_size):
+                batch = indices[start:start + self.batch_size]
+                arrays = [np.array(images[i]) for i in batch]
+                if len(arrays) == 1:
+                    results = [reader.readtext(arrays[0], detail=0, paragraph=True)]
+                else:
+                    results = reader.readtext_batched(arrays, detail=0, paragraph=True, batch_size=len(arrays))
+                for i, result in zip(batch, results):
+                    texts[i] = '\n'.join(result).strip()
+        return texts
+
+    def run(self, images: Dict[str, Image.Image]) -> Dict[str, str]:
+        """Return filtered OCR text keyed by image name"""
+        hashes = {}  # type: Dict[str, str]
+        to_ocr = {}  # type: Dict[str, Image.Image]  (hash -> first image with that hash)
+        skipped = cached = 0
+        for img_name, image in images.items():
+            key = content_hash(image)
+            hashes[img_name] = key
+            if key in self.cache:
+                cached += 1
+            elif key in to_ocr:
+                continue
+            elif is_probably_textless(image):
+                self.cache.set(key, '')
+                skipped += 1
+            else:
+                to_ocr[key] = image
+
+        if to_ocr:
+            keys = list(to_ocr)
+            for key, text in zip(keys, self._ocr([to_ocr[k] for k in keys])):
+                self.cache.set(key, text)
+        self.cache.save()
+
+        print(f"   {len(images)} images: {len(set(hashes.values()))} unique, {cached} cached, "
+              f"{skipped} skipped as non-text, {len(to_ocr)} OCR'd")
+        return {img_name: self.text_filter(self.cache.get(key)) for img_name, key in hashes.items()}
@@ -0,0 +1,153 @@
+"""
+Page-range parallel Marker conversion for large PDFs.
+
+A document is split into contiguous page ranges, each range is rendered by
+Marker in its own worker process (models loaded once per worker), and the
+markdown parts are stitched back together in page order with consistent
+heading levels and unique image references.
+"""
+import math
+import multiprocessing
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+HEADING_PATTERN = re.compile(r'^(#{1,6})(?=\s)', re.MULTILINE)
+IMAGE_REF_PATTERN = re.compile(r'!\[([^\]]*)\]\(([^)]+)\)')
+
+
+def count_pdf_pages(pdf_path: str) -> Optional[int]:
+    """Page count of a PDF, or None if it cannot be read"""
+    try:
+        import pypdfium2
+        pdf = pypdfium2.PdfDocument(pdf_path)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+    except Exception:
+        return None
+
+
+def split_page_ranges(page_count: int, parts: int, min_pages: int = 4) -> List[List[int]]:
+    """Split [0, page_count) into at most `parts` contiguous, equally sized ranges (about min_pages pages or more each)"""
+    parts = max(1, min(parts, math.ceil(page_count / max(1, min_pages))))
+    size = math.ceil(page_count / parts)
+    return [list(range(start, min(start + size, page_count))) for start in range(0, page_count, size)]
+
+
+def heading_levels(text: str) -> List[int]:
+    """Distinct markdown heading levels used in text, shallowest first"""
+    return sorted({len(m.group(1)) for m in HEADING_PATTERN.finditer(text)})
+
+
+def remap_heading_levels(text: str, reference: List[int]) -> str:
+    """
+    Map the distinct heading levels of text, in rank order, onto the reference levels.
+
+    Text using fewer distinct levels than the reference is returned unchanged:
+    which of the reference levels it lacks (a range without top-level
+    headings, say) cannot be told from the markdown, and ranking would
+    promote its headings.
+    """
+    levels = heading_levels(text)
+    if len(levels) < len(reference):
+        return text
+    mapping = {}
+    for rank, level in enumerate(levels):
+        if rank < len(reference):
+            mapping[level] = reference[rank]
+        else:
+            # Deeper than anything in the reference: keep the relative offset
+            mapping[level] = min(6, reference[-1] + rank - len(reference) + 1)
+    return HEADING_PATTERN.sub(lambda m: '#' * mapping[len(m.group(1))], text)
+
+
+def reference_levels(parts: List[str]) -> List[int]:
+    """Heading levels of the part using the most distinct levels (the first of them), [] if none has headings"""
+    return max(map(heading_levels, parts), key=len, default=[])
+
+
+def normalize_heading_levels(parts: List[str]) -> List[str]:
+    """
+    Marker assigns heading levels per conversion from the font sizes it sees,
+    so the same section level can come out as '#' in one range and '###' in
+    another. Map each part's distinct levels, in rank order, onto those of
+    the part with the most distinct levels. Parts using fewer levels are
+    left as they are, their offset being ambiguous (see remap_heading_levels).
+    """
+    reference = reference_levels(parts)
+    if not reference:
+        return parts
+    return [remap_heading_levels(text, reference) for text in parts]
+
+
+def stitch_markdown(parts: List[Tuple[str, Dict[str, Any]]]) -> Tuple[str, Dict[str, Any]]:
+    """Join (markdown, images) parts in order, renaming images whose names collide"""
+    texts = []
+    images = {}
+    for index, (text, part_images) in enumerate(parts):
+        renamed = {}
+        for name, image in part_images.items():
+            new_name = name if name not in images else f"range{index}_{name}"
+            renamed[name] = new_name
+            images[new_name] = image
+        if any(old != new for old, new in renamed.items()):
+            text = IMAGE_REF_PATTERN.sub(
+                lambda m: f"![{m.group(1)}]({renamed.get(m.group(2), m.group(2))})", text)
+        texts.append(text.strip('\n'))
+    return '\n\n'.join(normalize_heading_levels(texts)), images
+
+
+_worker_session = None
+
+
+def _init_worker():
+    """Load the Marker models once per worker process"""
+    global _worker_session
+    from app.utils.text_extraction import MarkerSession
+    _worker_session = MarkerSession()
+    _worker_session.converter
+
+
+def _render_range(pdf_path: str, page_range: List[int]) -> Tuple[str, Dict[str, Any]]:
+    return _worker_session.render(pdf_path, page_range=page_range)
+
+
+class PageParallelRenderer:
+    """
+    Process pool of warm Marker workers rendering page ranges of one PDF.
+
+    The pool is kept alive between documents; call close() when done.
+    """
+
+    def __init__(self, workers: int, min_pages_per_range: int = 4):
+        self.workers = max(1, workers)
+        self.min_pages_per_range = min_pages_per_range
+        self._executor = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Marker holds torch state that does not survive fork
+            self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context("spawn"),
+                                                 initializer=_init_worker)
+        return self._executor
+
+    def render(self, pdf_path: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Render a PDF across the pool; returns None if it is too small to be worth splitting"""
+        page_count = count_pdf_pages(pdf_path)
+        if not page_count:
+            return None
+        ranges = split_page_ranges(page_count, self.workers, self.min_pages_per_range)
+        if len(ranges) < 2:
+            return None
+        print(f"   Splitting {page_count} pages into {len(ranges)} ranges")
+        futures = [self.executor.submit(_render_range, pdf_path, page_range) for page_range in ranges]
+        return stitch_markdown([future.result() for future in futures])
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
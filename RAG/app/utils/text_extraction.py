@@ -1,11 +1,18 @@
 from marker.converters.pdf import PdfConverter
 from marker.models import create_model_dict
 from marker.output import text_from_rendered
+from dataclasses import dataclass
 from pathlib import Path
+import gc
+import os
+from typing import Any, Dict, List, Optional, Tuple, Union
 import easyocr
-import numpy as np
 import re
 
+from app.utils.image_ocr import ImageOCRStage, OCRCache
+from app.utils.page_parallel import (IMAGE_REF_PATTERN, PageParallelRenderer, count_pdf_pages, heading_levels,
+                                     remap_heading_levels)
+
 def filter_ocr_text(text: str) -> str:
     """
     Filter OCR text based on rules:
@@ -39,7 +46,288 @@ def filter_ocr_text(text: str) -> str:
     
     return text
 
-def pdf_to_markdown_ocr_inline(pdf_path: str, output_md_path: str = None, extract_images: bool = True) -> str:
+@dataclass
+class ConversionTask:
+    """A single PDF to convert, as accepted by MarkerSession.convert_many."""
+    pdf_path: str
+    output_md_path: Optional[str] = None
+    extract_images: bool = True
+    stream: bool = False
+
+
+class MarkerSession:
+    """
+    Holds the Marker models and the EasyOCR reader for a whole batch of PDFs.
+
+    Models are loaded lazily on first use and kept for the lifetime of the
+    session, so converting N documents pays the initialization cost once.
+    """
+
+    def __init__(self, ocr_languages: Optional[List[str]] = None, gpu: bool = False,
+                 ocr_cache_path: Optional[str] = None, ocr_batch_size: int = 8,
+                 max_memory_mb: Optional[float] = None):
+        self.ocr_languages = ocr_languages or ['en']
+        self.gpu = gpu
+        self.max_memory_mb = max_memory_mb
+        self._model_dict = None
+        self._converter = None
+        self._reader = None
+        self._page_renderer = None
+        self.ocr_stage = ImageOCRStage(lambda: self.reader, OCRCache(ocr_cache_path),
+                                       text_filter=filter_ocr_text, batch_size=ocr_batch_size)
+
+    @property
+    def converter(self) -> PdfConverter:
+        """Marker converter, created on first access"""
+        if self._converter is None:
+            print("⚙️ Loading Marker models...")
+            self._model_dict = create_model_dict()
+            self._converter = PdfConverter(self._model_dict)
+        return self._converter
+
+    @property
+    def reader(self) -> easyocr.Reader:
+        """EasyOCR reader, created on first access"""
+        if self._reader is None:
+            print("⚙️ Loading EasyOCR reader...")
+            self._reader = easyocr.Reader(self.ocr_languages, gpu=self.gpu, verbose=False)
+        return self._reader
+
+    def render(self, pdf_path: str, page_range: Optional[List[int]] = None) -> Tuple[str, Dict[str, Any]]:
+        """Run Marker on a PDF (or only the given 0-indexed pages) and return (markdown, images)"""
+        converter = self.converter
+        if page_range is not None:
+            converter = PdfConverter(self._model_dict, config={"page_range": page_range})
+        text, metadata, images = text_from_rendered(converter(pdf_path))
+        return text, images
+
+    def render_parallel(self, pdf_path: str, page_workers: int) -> Tuple[str, Dict[str, Any]]:
+        """Render page ranges in page_workers processes; small PDFs are rendered in-process"""
+        if self._page_renderer is None or self._page_renderer.workers != page_workers:
+            self.close()
+            self._page_renderer = PageParallelRenderer(page_workers)
+        rendered = self._page_renderer.render(pdf_path)
+        if rendered is None:
+            return self.render(pdf_path)
+        return rendered
+
+    def close(self):
+        """Shut down the page-range worker pool, if one was started"""
+        if self._page_renderer is not None:
+            self._page_renderer.close()
+            self._page_renderer = None
+
+    def ocr_images(self, images: Dict[str, Any]) -> Dict[str, str]:
+        """OCR every image and return filtered text keyed by image name"""
+        return self.ocr_stage.run(images)
+
+    def convert(self, pdf_path: str, output_md_path: str = None, extract_images: bool = True,
+                page_workers: int = 1) -> str:
+        """
+        Convert PDF to Markdown with optional OCR text extraction from images
+
+        Args:
+            pdf_path: Path to PDF file
+            output_md_path: Output markdown path (optional)
+            extract_images: If True, replace images with OCR text; if False, remove image references (default: True)
+            page_workers: If > 1, split the PDF into page ranges converted in that many processes (default: 1)
+
+        Returns:
+            Markdown text with OCR text inline (if extract_images=True) or with image references removed
+        """
+        print(f"📄 Converting: {pdf_path}")
+
+        # Step 1: Convert with Marker
+        print("⚙️ Extracting with Marker...")
+        if page_workers > 1:
+            text, images = self.render_parallel(pdf_path, page_workers)
+        else:
+            text, images = self.render(pdf_path)
+        print(f"   Found {len(images)} images")
+
+        # Step 2: OCR images and replace (only if extract_images is True)
+        if extract_images and images:
+            print(f"\n🔍 OCR on {len(images)} images...")
+            ocr_results = self.ocr_images(images)
+
+            # Step 3: Replace image references with OCR text
+            print("\n📝 Replacing image references with OCR text...")
+            text = replace_image_references(text, ocr_results)
+
+        elif not extract_images and images:
+            print(f"\n🗑️ Removing {len(images)} image references (extract_images=False)")
+            text = replace_image_references(text, {})
+
+        # Step 4: Save markdown
+        if output_md_path is None:
+            output_md_path = str(Path(pdf_path).with_suffix('.md'))
+
+        with open(output_md_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+        print(f"\n✅ Done! Saved to: {output_md_path}")
+        print(f"   Final text length: {len(text):,} characters\n")
+
+        return text
+
+    def convert_streaming(self, pdf_path: str, output_md_path: str = None, extract_images: bool = True,
+                          pages_per_step: int = 4) -> str:
+        """
+        Convert PDF to Markdown a few pages at a time, writing each step to disk as it completes.
+
+        Only one step's text and images are held in memory; images are released right
+        after OCR. max_memory_mb is not a hard ceiling: RSS is only measured between
+        steps, so a step can go above it. When it is found above, the step size is
+        halved, and the conversion is aborted with a MemoryError if it is still
+        above at one page per step. Set it below the real limit by the memory one
+        step can take.
+        The output is written to a .partial file and renamed once complete.
+
+        Args:
+            pdf_path: Path to PDF file
+            output_md_path: Output markdown path (optional)
+            extract_images: If True, replace images with OCR text; if False, remove image references (default: True)
+            pages_per_step: Number of pages rendered per step (default: 4)
+
+        Returns:
+            Path of the written markdown file
+        """
+        print(f"📄 Converting (streaming): {pdf_path}")
+        if output_md_path is None:
+            output_md_path = str(Path(pdf_path).with_suffix('.md'))
+        partial_path = f"{output_md_path}.partial"
+
+        page_count = count_pdf_pages(pdf_path)
+        if page_count is None:
+            raise ValueError(f"Could not read page count of {pdf_path}")
+
+        reference_levels = []  # type: List[int]
+        written = 0
+        page = 0
+        with open(partial_path, 'w', encoding='utf-8') as f:
+            while page < page_count:
+                self._check_memory(pages_per_step)
+                page_range = list(range(page, min(page + pages_per_step, page_count)))
+                text, images = self.render(pdf_path, page_range=page_range)
+
+                if extract_images and images:
+                    ocr_results = self.ocr_images(images)
+                else:
+                    ocr_results = {}
+                for image in images.values():
+                    image.close()
+                del images
+                text = replace_image_references(text, ocr_results).strip('\n')
+
+                # Keep heading levels consistent with the step using the most distinct levels so far;
+                # steps using fewer are left as they are (see remap_heading_levels)
+                if reference_levels:
+                    text = remap_heading_levels(text, reference_levels)
+                levels = heading_levels(text)
+                if len(levels) > len(reference_levels):
+                    reference_levels = levels
+
+                if text:
+                    f.write(('\n\n' if written else '') + text)
+                    written += len(text) + (2 if written else 0)
+                del text, ocr_results
+                gc.collect()
+
+                page = page_range[-1] + 1
+                rss = current_rss_mb()
+                print(f"   Pages {page}/{page_count} written ({rss:.0f} MB RSS)")
+                if self.max_memory_mb and rss > self.max_memory_mb and pages_per_step > 1:
+                    pages_per_step = max(1, pages_per_step // 2)
+                    print(f"   ⚠️ Above {self.max_memory_mb:.0f} MB, reducing to {pages_per_step} page(s) per step")
+        os.replace(partial_path, output_md_path)
+
+        print(f"\n✅ Done! Saved to: {output_md_path}")
+        print(f"   Final text length: {written:,} characters\n")
+        return output_md_path
+
+    def _check_memory(self, pages_per_step: int):
+        """Abort (MemoryError) if RSS is above max_memory_mb and the step cannot shrink further"""
+        if not self.max_memory_mb:
+            return
+        rss = current_rss_mb()
+        if rss > self.max_memory_mb and pages_per_step <= 1:
+            raise MemoryError(f"RSS {rss:.0f} MB exceeds the {self.max_memory_mb:.0f} MB ceiling "
+                              f"even at one page per step")
+
+    def convert_many(self, tasks: List[Union[str, ConversionTask]]) -> List[Optional[str]]:
+        """
+        Convert a list of PDFs with the models loaded once for the whole batch.
+
+        Args:
+            tasks: PDF paths or ConversionTask entries
+
+        Returns:
+            Markdown text for each task, in order (the output path for streamed tasks, None if the conversion failed)
+        """
+        tasks = [ConversionTask(t) if isinstance(t, (str, Path)) else t for t in tasks]
+        outputs = []
+        for n, task in enumerate(tasks, 1):
+            print(f"[{n}/{len(tasks)}] Processing: {task.pdf_path} -> {task.output_md_path}")
+            try:
+                if task.stream:
+                    self.convert_streaming(task.pdf_path, task.output_md_path, extract_images=task.extract_images)
+                    outputs.append(task.output_md_path or str(Path(task.pdf_path).with_suffix('.md')))
+                else:
+                    outputs.append(self.convert(task.pdf_path, task.output_md_path, extract_images=task.extract_images))
+            except Exception as e:
+                print(f"❌ Failed to convert {task.pdf_path}: {e}")
+                outputs.append(None)
+        return outputs
+
+
+def replace_image_references(text: str, ocr_results: Dict[str, str]) -> str:
+    """
+    Replace markdown image references with their OCR text.
+
+    Images without OCR text (or missing from ocr_results) are removed.
+    """
+    def replace_with_ocr(match):
+        img_name = match.group(2)
+        ocr_text = ocr_results.get(img_name, "")
+        if ocr_text:
+            # Replace with OCR text only (no image)
+            return f"\n{ocr_text}\n"
+        else:
+            # No text found, remove image reference
+            return "\n"
+
+    text = IMAGE_REF_PATTERN.sub(replace_with_ocr, text)
+
+    # Clean up excessive newlines
+    return re.sub(r'\n{3,}', '\n\n', text)
+
+
+def current_rss_mb() -> float:
+    """Resident set size of this process in MB"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+    except (OSError, ValueError):
+        # Not Linux: fall back to the peak RSS (KB on Linux, bytes on macOS)
+        import resource
+        import sys
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+
+_default_session = None
+
+
+def get_default_session() -> MarkerSession:
+    """Process-wide session shared by pdf_to_markdown_ocr_inline calls"""
+    global _default_session
+    if _default_session is None:
+        _default_session = MarkerSession()
+    return _default_session
+
+
+def pdf_to_markdown_ocr_inline(pdf_path: str, output_md_path: str = None, extract_images: bool = True,
+                               session: Optional[MarkerSession] = None, page_workers: int = 1) -> str:
     """
     Convert PDF to Markdown with optional OCR text extraction from images
     
@@ -47,85 +335,14 @@ def pdf_to_markdown_ocr_inline(pdf_path: str, output_md_path: str = None, extrac
         pdf_path: Path to PDF file
         output_md_path: Output markdown path (optional)
         extract_images: If True, replace images with OCR text; if False, remove image references (default: True)
+        session: MarkerSession holding the loaded models (default: shared process-wide session)
+        page_workers: If > 1, split the PDF into page ranges converted in that many processes (default: 1)
     
     Returns:
         Markdown text with OCR text inline (if extract_images=True) or with image references removed
     """
-    print(f"📄 Converting: {pdf_path}")
-    
-    # Step 1: Convert with Marker
-    print("⚙️ Extracting with Marker...")
-    model_dict = create_model_dict()
-    converter = PdfConverter(model_dict)
-    text, metadata, images = text_from_rendered(converter(pdf_path))
-    print(f"   Found {len(images)} images")
-    
-    # Step 2: OCR images and replace (only if extract_images is True)
-    if extract_images and images:
-        print(f"\n🔍 OCR on {len(images)} images...")
-        # Initialize EasyOCR
-        reader = easyocr.Reader(['en'], gpu=False, verbose=False)
-        
-        ocr_results = {}
-        for i, (img_name, img_data) in enumerate(images.items(), 1):
-            print(f"   [{i}/{len(images)}] {img_name}...", end=" ")
-            
-            # OCR the image
-            img_array = np.array(img_data)
-            results = reader.readtext(img_array, detail=0, paragraph=True)
-            ocr_text = '\n'.join(results).strip()
-            
-            # Apply filtering
-            filtered_text = filter_ocr_text(ocr_text)
-            ocr_results[img_name] = filtered_text
-            
-            if filtered_text:
-                preview = filtered_text[:60].replace('\n', ' ')
-                print(f"✓")
-                print(f"      → {preview}...")
-            else:
-                print("✓ (filtered out)")
-        
-        # Step 3: Replace image references with OCR text
-        print("\n📝 Replacing image references with OCR text...")
-        def replace_with_ocr(match):
-            img_name = match.group(2)
-            ocr_text = ocr_results.get(img_name, "")
-            if ocr_text:
-                # Replace with OCR text only (no image)
-                return f"\n{ocr_text}\n"
-            else:
-                # No text found, remove image reference
-                return "\n"
-        
-        # Replace all image markdown references
-        pattern = r'!\[([^\]]*)\]\(([^)]+)\)'
-        text = re.sub(pattern, replace_with_ocr, text)
-        
-        # Clean up excessive newlines
-        text = re.sub(r'\n{3,}', '\n\n', text)
-    
-    elif not extract_images and images:
-        print(f"\n🗑️ Removing {len(images)} image references (extract_images=False)")
-        
-        # Remove all image markdown references
-        pattern = r'!\[([^\]]*)\]\(([^)]+)\)'
-        text = re.sub(pattern, '\n', text)
-        
-        # Clean up excessive newlines
-        text = re.sub(r'\n{3,}', '\n\n', text)
-    
-    # Step 4: Save markdown
-    if output_md_path is None:
-        output_md_path = str(Path(pdf_path).with_suffix('.md'))
-    
-    with open(output_md_path, 'w', encoding='utf-8') as f:
-        f.write(text)
-    
-    print(f"\n✅ Done! Saved to: {output_md_path}")
-    print(f"   Final text length: {len(text):,} characters\n")
-    
-    return text
+    session = session or get_default_session()
+    return session.convert(pdf_path, output_md_path, extract_images=extract_images, page_workers=page_workers)
 # Usage
 """markdown = pdf_to_markdown_ocr_inline(
     "/home/ghassen/Downloads/Qcells_Data_sheet_Q.TRON_BLK_S-G3R.12+-BFG_435-450_2025-08_Rev04_EN.pdf",
@@ -0,0 +1,68 @@
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from app.utils import conversion_runner
+from app.utils.conversion_runner import DONE, FAILED, IN_PROGRESS, PENDING, ConversionQueue, ConversionRunner
+
+
+@dataclass
+class Task:
+    """Same fields as text_extraction.ConversionTask, without importing Marker"""
+    pdf_path: str
+    output_md_path: Optional[str] = None
+    extract_images: bool = True
+    stream: bool = False
+
+
+def _no_models(ocr_cache_path, max_memory_mb):
+    pass
+
+
+def _convert_or_die(task: Dict[str, Any]) -> Dict[str, Any]:
+    if 'crash' in os.path.basename(task['pdf_path']):
+        os._exit(1)  # as if the worker was OOM-killed
+    return {'ok': True, 'error': None, 'seconds': 0.0}
+
+
+def test_task_that_kills_its_worker_is_marked_failed(tmp_path, monkeypatch):
+    monkeypatch.setattr(conversion_runner, '_init_worker', _no_models)
+    monkeypatch.setattr(conversion_runner, '_convert_in_worker', _convert_or_die)
+    queue_path = str(tmp_path / "queue.json")
+    tasks = [Task(str(tmp_path / "ok.pdf"), str(tmp_path / "ok.md")),
+             Task(str(tmp_path / "crash.pdf"), str(tmp_path / "crash.md")),
+             Task(str(tmp_path / "later.pdf"), str(tmp_path / "later.md"))]
+
+    counts = ConversionRunner(queue_path, workers=1).run(tasks)
+
+    assert counts == {PENDING: 1, IN_PROGRESS: 0, DONE: 1, FAILED: 1}
+    queue = ConversionQueue(queue_path)
+    crashed = queue.entries[tasks[1].pdf_path]
+    assert crashed['status'] == FAILED
+    assert crashed['error'].startswith("worker crashed")
+    # The next run does not pick the crashing file up again unless asked to
+    assert queue.recover() == 0
+    assert queue.recover(retry_failed=True) == 1
+
+
+def test_pending_entries_take_the_options_of_the_new_run(tmp_path):
+    queue_path = str(tmp_path / "queue.json")
+    pending = Task(str(tmp_path / "pending.pdf"), str(tmp_path / "pending.md"))
+    done = Task(str(tmp_path / "done.pdf"), str(tmp_path / "done.md"))
+    queue = ConversionQueue(queue_path)
+    queue.add([pending, done])
+    (tmp_path / "done.md").write_text("converted")
+    queue.mark(done.pdf_path, DONE)
+
+    rerun = [Task(pending.pdf_path, str(tmp_path / "other.md"), extract_images=False, stream=True),
+             Task(done.pdf_path, done.output_md_path, extract_images=False, stream=True)]
+    assert ConversionQueue(queue_path).add(rerun) == 0
+
+    entries = ConversionQueue(queue_path).entries
+    assert entries[pending.pdf_path]['output_md_path'] == str(tmp_path / "other.md")
+    assert entries[pending.pdf_path]['extract_images'] is False
+    assert entries[pending.pdf_path]['stream'] is True
+    assert entries[pending.pdf_path]['status'] == PENDING
+    # Already converted: kept as it is, its output is not redone behind the user's back
+    assert entries[done.pdf_path]['stream'] is False
+    assert entries[done.pdf_path]['status'] == DONE
@@ -0,0 +1,50 @@
+import numpy as np
+from PIL import Image, ImageDraw
+
+from app.utils.image_ocr import ImageOCRStage, OCRCache
+
+
+class FakeReader:
+    """Stands in for easyocr.Reader: 'reads' the label drawn into the image"""
+
+    def __init__(self, labels):
+        self.labels = labels
+        self.calls = 0
+
+    def readtext(self, array, detail=0, paragraph=True):
+        self.calls += 1
+        return [self.labels[array.tobytes()]]
+
+    def readtext_batched(self, arrays, detail=0, paragraph=True, batch_size=1):
+        return [self.readtext(array) for array in arrays]
+
+
+def _badge(part_number: str) -> Image.Image:
+    image = Image.new('RGB', (160, 40), 'white')
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((2, 2, 157, 37), outline='black')
+    draw.text((10, 14), f"Certified part {part_number}", fill='black')
+    return image
+
+
+def test_look_alike_images_keep_their_own_text(tmp_path):
+    first, second = _badge("STM32F401"), _badge("STM32F407")
+    labels = {np.array(image).tobytes(): f"text of {name}" for name, image in (('first', first), ('second', second))}
+    reader = FakeReader(labels)
+    stage = ImageOCRStage(lambda: reader, OCRCache(str(tmp_path / "ocr.json")))
+
+    texts = stage.run({'a.png': first, 'b.png': second, 'c.png': first.copy()})
+
+    assert texts == {'a.png': "text of first", 'b.png': "text of second", 'c.png': "text of first"}
+    assert reader.calls == 2
+
+
+def test_cache_is_reused_across_documents(tmp_path):
+    image = _badge("STM32F401")
+    reader = FakeReader({np.array(image).tobytes(): "badge"})
+    ImageOCRStage(lambda: reader, OCRCache(str(tmp_path / "ocr.json"))).run({'a.png': image})
+
+    texts = ImageOCRStage(lambda: reader, OCRCache(str(tmp_path / "ocr.json"))).run({'b.png': image.copy()})
+
+    assert texts == {'b.png': "badge"}
+    assert reader.calls == 1
@@ -0,0 +1,26 @@
+from app.utils.page_parallel import normalize_heading_levels, remap_heading_levels, split_page_ranges
+
+
+def test_split_page_ranges_covers_every_page_once():
+    ranges = split_page_ranges(10, parts=3, min_pages=2)
+    assert [page for page_range in ranges for page in page_range] == list(range(10))
+    assert len(ranges) == 3
+
+
+def test_part_with_all_levels_is_aligned_on_the_reference():
+    parts = ["# Title\n\n## Section\n\ntext", "### Other title\n\n#### Other section\n\ntext"]
+    assert normalize_heading_levels(parts)[1] == "# Other title\n\n## Other section\n\ntext"
+
+
+def test_part_without_the_top_level_is_not_promoted():
+    parts = ["# Title\n\n## Section\n\n### Subsection", "## Section 2\n\n### Subsection 2.1"]
+    assert normalize_heading_levels(parts) == parts
+
+
+def test_reference_is_the_part_with_most_levels():
+    parts = ["## Section\n\ntext", "# Title\n\n## Section\n\n### Subsection"]
+    assert normalize_heading_levels(parts) == parts
+
+
+def test_levels_deeper_than_the_reference_keep_their_offset():
+    assert remap_heading_levels("## A\n### B\n##### C", [1, 2]) == "# A\n## B\n### C"
@@ -3,29 +3,90 @@
 from fastapi import APIRouter, File, UploadFile, Form, HTTPException
 from fastapi.responses import FileResponse, JSONResponse, HTMLResponse, StreamingResponse
 from pathlib import Path
+import os
 import shutil
 from datetime import datetime
-from typing import Optional
-import traceback
-import zipfile
-from io import BytesIO
+from typing import List, Optional
+import asyncio
+import json
+import logging
 import time
+import uuid
+import zipfile
 import psutil
 # Import your extraction function
 from app.core.py_pdf_stm.TableExtractor import extract_all_tables_auto
+from app.core.batch import TooManyFiles, build_consolidated_workbook, iter_extract_files, output_name, unpack_pdfs
+from app.core.job_queue import DONE, FAILED, QUEUED, RUNNING, JobQueue
+from app.core.job_registry import JobRegistry
+from app.core.result_cache import ResultCache
+from app.core.uploads import UploadTooLarge, save_upload
+from app.core.zip_stream import iter_zip
 
 # Create router instead of app
 router = APIRouter(prefix="/pdf-extractor", tags=["PDF Table Extractor"])
+logger = logging.getLogger(__name__)
 
 # Configuration
 UPLOAD_FOLDER = Path("uploads")
 OUTPUT_FOLDER = Path("outputs")
 MAX_FILE_SIZE = 500 * 1024 * 1024  # 500 MB
+UPLOAD_HASH = os.environ.get("UPLOAD_HASH", "sha256") or None  # digest computed while uploading; empty to disable
+EXTRACTION_WORKERS = int(os.environ.get("EXTRACTION_WORKERS", "1"))  # processes parsing pages per PDF
+EXTRACTION_CONCURRENCY = int(os.environ.get("EXTRACTION_CONCURRENCY", "2"))  # PDFs extracted at the same time
+JOB_EVENTS_INTERVAL = 0.5  # seconds between job-events checks
+RESULT_CACHE_FOLDER = Path(os.environ.get("RESULT_CACHE_FOLDER", "cache/results"))
+RESULT_CACHE_MAX_MB = float(os.environ.get("RESULT_CACHE_MAX_MB", "2048"))  # 0 disables the result cache
+JOB_REGISTRY_PATH = Path(os.environ.get("JOB_REGISTRY_PATH", str(OUTPUT_FOLDER / "jobs.sqlite3")))
+JOB_TTL_HOURS = float(os.environ.get("JOB_TTL_HOURS", "0"))  # finished jobs older than this are deleted; 0 keeps them
+JOB_CLEANUP_INTERVAL = 3600  # seconds between checks for expired jobs
+JOB_RETENTION_SECONDS = float(os.environ.get("JOB_RETENTION_SECONDS", "3600"))  # finished jobs kept in memory
+BATCH_WORKERS = int(os.environ.get("BATCH_WORKERS", str(os.cpu_count() or 1)))  # processes per batch, one PDF each
+BATCH_MAX_FILES = int(os.environ.get("BATCH_MAX_FILES", "100"))
+BATCH_MAX_TOTAL_SIZE = int(os.environ.get("BATCH_MAX_TOTAL_MB", "2048")) * 1024 * 1024  # all PDFs of a batch, unpacked
+CONSOLIDATED_WORKBOOK = "consolidated.xlsx"
+
+# Largest file data per upload request, enforced by UploadSizeLimit (app/main.py) before the form is parsed
+UPLOAD_LIMITS = {
+    f"{router.prefix}/extract-tables": MAX_FILE_SIZE,
+    f"{router.prefix}/extract-batch": BATCH_MAX_TOTAL_SIZE,
+}
 
 # Create necessary directories
 UPLOAD_FOLDER.mkdir(exist_ok=True)
 OUTPUT_FOLDER.mkdir(exist_ok=True)
 
+# Persistent index of all jobs, for listing and cleanup
+job_registry = JobRegistry(JOB_REGISTRY_PATH)
+if job_registry.is_new:
+    job_registry.import_directories(OUTPUT_FOLDER, DONE)
+job_registry.mark_interrupted((QUEUED, RUNNING), FAILED, "Interrupted by a server restart")
+
+
+def record_finished(job):
+    """Store the outcome of a finished job in the registry (called on the job worker thread)"""
+    result = job['result'] or {}
+    job_registry.update(
+        job['job_id'],
+        status=job['status'],
+        finished_at=job['finished_at'],
+        pages=result.get('summary', {}).get('total_pages_processed'),
+        tables=result.get('summary', {}).get('total_tables_extracted'),
+        processing_seconds=result.get('performance', {}).get('processing_time_seconds'),
+        cache=result.get('cache'),
+        error=job['error']['error'] if job['error'] else None,
+        csv_files=result.get('csv_files', []),
+        excel_files=result.get('excel_files', [])
+    )
+
+
+# Extraction jobs run here, off the event loop
+job_queue = JobQueue(max_concurrent=EXTRACTION_CONCURRENCY, on_finish=record_finished,
+                     retention=JOB_RETENTION_SECONDS)
+
+# Results of previously seen PDFs, keyed by content hash
+result_cache = ResultCache(RESULT_CACHE_FOLDER, int(RESULT_CACHE_MAX_MB * 1024 * 1024)) if RESULT_CACHE_MAX_MB > 0 else None
+
 # Update the HTML_TEMPLATE in pdf_extractor.py
 
 HTML_TEMPLATE = """
@@ -357,7 +418,7 @@ HTML_TEMPLATE = """
         <div class="card progress-section" id="progressSection">
             <h2 class="section-title">Processing...</h2>
             <div class="spinner"></div>
-            <p>Extracting tables from your PDF. This may take a few moments...</p>
+            <p id="progressText">Extracting tables from your PDF. This may take a few moments...</p>
         </div>
 
         <div class="card results-section" id="resultsSection">
@@ -431,6 +492,8 @@ HTML_TEMPLATE = """
 
             document.getElementById('uploadSection').style.display = 'none';
             document.getElementById('progressSection').style.display = 'block';
+            document.getElementById('progressText').textContent =
+                'Extracting tables from your PDF. This may take a few moments...';
 
             try {
                 const formData = new FormData();
@@ -448,12 +511,16 @@ HTML_TEMPLATE = """
                     body: formData
                 });
 
-                const result = await response.json();
+                const job = await response.json();
+                if (!response.ok) {
+                    throw new Error(job.detail || 'Upload failed');
+                }
 
-                if (response.ok && result.success) {
+                const result = await waitForJob(job.job_id);
+                if (result && result.success) {
                     displayResults(result);
                 } else {
-                    throw new Error(result.error || 'Extraction failed');
+                    throw new Error('Extraction failed');
                 }
 
             } catch (error) {
@@ -463,6 +530,28 @@ HTML_TEMPLATE = """
             }
         });
 
+        async function waitForJob(jobId) {
+            while (true) {
+                const response = await fetch(`/pdf-extractor/job-status/${jobId}`);
+                const job = await response.json();
+                if (!response.ok) {
+                    throw new Error(job.detail || 'Job not found');
+                }
+                if (job.status === 'done') {
+                    return job.result;
+                }
+                if (job.status === 'failed') {
+                    throw new Error(job.error ? job.error.error : 'Extraction failed');
+                }
+                const progress = job.progress || {};
+                if (progress.pages_total) {
+                    document.getElementById('progressText').textContent =
+                        `Page ${progress.pages_done} of ${progress.pages_total} - ${progress.tables_found} table(s) found`;
+                }
+                await new Promise(resolve => setTimeout(resolve, 1000));
+            }
+        }
+
         function displayResults(result) {
             currentJobId = result.job_id;
 
@@ -536,57 +625,49 @@ async def index():
     return HTML_TEMPLATE
 
 
-@router.post("/extract-tables")
-async def extract_tables(
-    file: UploadFile = File(...),
-    debug: Optional[str] = Form(None),
-    output_format: Optional[str] = Form('csv')  # Add this parameter
-):
-    """Extract tables from uploaded PDF file"""
-    
-    # Validate file type
-    if not file.filename.endswith('.pdf'):
-        raise HTTPException(status_code=400, detail="Only PDF files are allowed")
-    
-    # Validate output format
-    if output_format not in ['csv', 'excel', 'both']:
-        raise HTTPException(status_code=400, detail="Invalid output format. Must be 'csv', 'excel', or 'both'")
-    
-    # Check file size
-    contents = await file.read()
-    if len(contents) > MAX_FILE_SIZE:
-        raise HTTPException(
-            status_code=413, 
-            detail=f"File too large. Maximum size is {MAX_FILE_SIZE / (1024*1024)} MB"
-        )
-    
-    # Generate unique output directory
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    safe_filename = file.filename.rsplit('.', 1)[0]
-    job_id = f"{timestamp}_{safe_filename}"
-    
-    output_dir = OUTPUT_FOLDER / job_id
-    output_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Save uploaded file temporarily
-    temp_pdf_path = UPLOAD_FOLDER / f"{job_id}.pdf"
+def run_extraction(job_id, filename, pdf_path, output_dir, output_format, debug_mode, progress, file_hash=None):
+    """
+    Extract the tables of a saved upload and build the API response (runs on a job worker thread).
+    Uploads seen before (same content hash) are served from the result cache.
+    """
     start_time = time.time()
     process = psutil.Process()
     mem_before = process.memory_info().rss / 1024 / 1024  # MB
-    
+    counters = {'pages_done': 0, 'tables_found': 0, 'tables_merged': 0}
+
+    def on_event(kind, entry):
+        if kind == 'start':
+            progress(pages_total=entry['pages'], **counters)
+            return
+        if kind == 'page':
+            counters['pages_done'] += 1
+        elif kind == 'success':
+            counters['tables_found'] += 1
+        elif kind == 'merged':
+            counters['tables_merged'] += 1
+        else:
+            return
+        progress(**counters)
+
     try:
-        # Save file
-        with open(temp_pdf_path, 'wb') as f:
-            f.write(contents)
-        
-        # Extract tables with specified format
-        debug_mode = debug and debug.lower() == 'true'
-        results = extract_all_tables_auto(
-            path=str(temp_pdf_path),
-            output_directory=str(output_dir),
-            debug=debug_mode,
-            output_format=output_format  # Pass the format
-        )
+        cache_key = ResultCache.make_key(file_hash, output_format) if result_cache and file_hash else None
+        results = result_cache.lookup(cache_key, output_dir) if cache_key else None
+        cache_status = 'hit' if results is not None else ('miss' if cache_key else 'disabled')
+        if results is None:
+            # Extract tables with specified format
+            results = extract_all_tables_auto(
+                path=str(pdf_path),
+                output_directory=str(output_dir),
+                debug=debug_mode,
+                output_format=output_format,  # Pass the format
+                workers=EXTRACTION_WORKERS,
+                progress=on_event
+            )
+            if cache_key:
+                result_cache.store(cache_key, output_dir, results)
+        else:
+            progress(pages_total=results['total_pages_processed'], pages_done=results['total_pages_processed'],
+                     tables_found=results['total_tables'], tables_merged=len(results['merged']))
         
         # Get list of generated files
         csv_files = [f.name for f in output_dir.glob('*.csv')]
@@ -596,63 +677,431 @@ async def extract_tables(
         response = {
             'success': True,
             'job_id': job_id,
-            'filename': file.filename,
+            'filename': filename,
             'output_format': output_format,
             'summary': {
                 'total_pages_processed': results['total_pages_processed'],
                 'total_tables_extracted': results['total_tables'],
                 'tables_merged': len(results['merged']),
                 'tables_skipped': len(results['skipped']),
+                'pages_skipped_by_prescreen': results['prescreen']['pages_skipped'],
                 'errors': len(results['errors'])
             },
+            'prescreen': results['prescreen'],
             'extracted_tables': results['success'],
             'merged_tables': results['merged'],
             'skipped': results['skipped'],
             'errors': results['errors'],
             'csv_files': csv_files,
             'excel_files': excel_files,
-            'output_directory': str(output_dir)
+            'output_directory': str(output_dir),
+            'cache': cache_status
         }
         
         processing_time = time.time() - start_time
         mem_after = process.memory_info().rss / 1024 / 1024
+        timing = results.get('timing')  # absent on a cache hit: nothing was extracted by this job
         response['performance'] = {
             'processing_time_seconds': round(processing_time, 2),
             'memory_used_mb': round(mem_after - mem_before, 2),
             'pages_per_second': round(results['total_pages_processed'] / processing_time, 2) if processing_time > 0 else 0,
-            'tables_per_second': round(results['total_tables'] / processing_time, 2) if processing_time > 0 else 0
+            'tables_per_second': round(results['total_tables'] / processing_time, 2) if processing_time > 0 else 0,
+            # Time and line/point/cell counts per extraction phase, in total and per page
+            'phases': timing['phases'] if timing else None,
+            'pages': timing['pages'] if timing else None
         }
         
-        print(response["performance"])
-        return JSONResponse(content=response)
+        logger.debug('Job %s performance: %s', job_id,
+                     {key: value for key, value in response['performance'].items() if key not in ('phases', 'pages')})
+        return response
         
-    except Exception as e:
+    except Exception:
         # Clean up on error
         if output_dir.exists():
             shutil.rmtree(output_dir, ignore_errors=True)
-        
-        raise HTTPException(
-            status_code=500,
-            detail={
-                'error': str(e),
-                'traceback': traceback.format_exc() 
-            }
-        )
+        raise
         
     finally:
         # Clean up temporary PDF
-        if temp_pdf_path.exists():
-            temp_pdf_path.unlink()
+        if pdf_path.exists():
+            pdf_path.unlink()
+
+
+def run_batch(job_id, sources, upload_dir, output_dir, output_format, consolidated, progress):
+    """
+    Extract the PDFs of a batch job, one worker process per file, and build the
+    combined response (runs on a job worker thread). Every file gets its own
+    sub-directory of output_dir; files seen before come from the result cache.
+    """
+    start_time = time.time()
+    taken = set()
+    files = []
+    pending = []
+    try:
+        for source in sources:
+            file_dir = output_dir / output_name(source['filename'], taken)
+            file_dir.mkdir(parents=True, exist_ok=True)
+            cache_key = ResultCache.make_key(source['hash'], output_format) if result_cache and source['hash'] else None
+            results = result_cache.lookup(cache_key, file_dir) if cache_key else None
+            files.append({
+                'filename': source['filename'],
+                'directory': file_dir,
+                'cache_key': cache_key,
+                'cache': 'hit' if results is not None else ('miss' if cache_key else 'disabled'),
+                'results': results,
+                'error': None
+            })
+            if results is None:
+                pending.append(len(files) - 1)
+
+        def report():
+            done = [f for f in files if f['results'] is not None or f['error'] is not None]
+            progress(files_total=len(files), files_done=len(done),
+                     files_failed=sum(1 for f in done if f['error'] is not None),
+                     tables_found=sum(f['results']['total_tables'] for f in done if f['results'] is not None))
+
+        report()
+        jobs = [(str(sources[index]['path']), str(files[index]['directory'])) for index in pending]
+        for job_index, results, error in iter_extract_files(jobs, output_format, BATCH_WORKERS):
+            entry = files[pending[job_index]]
+            entry['results'], entry['error'] = results, error
+            if results is not None and entry['cache_key']:
+                result_cache.store(entry['cache_key'], entry['directory'], results)
+            if error is not None:
+                shutil.rmtree(entry['directory'], ignore_errors=True)
+            report()
+
+        response_files = []
+        consolidated_tables = []
+        phases = {}
+        pages = []
+        for entry in files:
+            subdirectory = entry['directory'].name
+            results = entry['results']
+            if results is None:
+                response_files.append({'filename': entry['filename'], 'success': False, 'error': entry['error'],
+                                       'cache': entry['cache']})
+                continue
+            consolidated_tables += [{**table, 'source': entry['filename']} for table in results['success']]
+            # Only files extracted by this job have timings; cache hits have none
+            timing = results.get('timing', {'phases': {}, 'pages': []})
+            for name, stats in timing['phases'].items():
+                totals = phases.setdefault(name, {})
+                for key, value in stats.items():
+                    totals[key] = round(totals.get(key, 0) + value, 4)
+            pages += [{'file': entry['filename'], **page} for page in timing['pages']]
+            response_files.append({
+                'filename': entry['filename'],
+                'success': True,
+                'cache': entry['cache'],
+                'output_subdirectory': subdirectory,
+                'summary': {
+                    'total_pages_processed': results['total_pages_processed'],
+                    'total_tables_extracted': results['total_tables'],
+                    'tables_merged': len(results['merged']),
+                    'tables_skipped': len(results['skipped']),
+                    'pages_skipped_by_prescreen': results['prescreen']['pages_skipped'],
+                    'errors': len(results['errors'])
+                },
+                'extracted_tables': results['success'],
+                'merged_tables': results['merged'],
+                'skipped': results['skipped'],
+                'errors': results['errors'],
+                'csv_files': [f"{subdirectory}/{f.name}" for f in entry['directory'].glob('*.csv')],
+                'excel_files': [f"{subdirectory}/{f.name}" for f in entry['directory'].glob('*.xlsx')]
+            })
+
+        workbook = None
+        if consolidated and consolidated_tables:
+            build_consolidated_workbook(consolidated_tables, output_dir / CONSOLIDATED_WORKBOOK)
+            workbook = CONSOLIDATED_WORKBOOK
+
+        succeeded = [f for f in response_files if f['success']]
+        cache_states = {entry['cache'] for entry in files}
+        total_pages = sum(f['summary']['total_pages_processed'] for f in succeeded)
+        total_tables = sum(f['summary']['total_tables_extracted'] for f in succeeded)
+        processing_time = time.time() - start_time
+        return {
+            'success': True,
+            'job_id': job_id,
+            'batch': True,
+            'filename': f"{len(files)} files",
+            'output_format': output_format,
+            'summary': {
+                'files': len(files),
+                'files_failed': len(files) - len(succeeded),
+                'total_pages_processed': total_pages,
+                'total_tables_extracted': total_tables,
+                'tables_merged': sum(f['summary']['tables_merged'] for f in succeeded)
+            },
+            'files': response_files,
+            'consolidated_workbook': workbook,
+            'csv_files': [name for f in succeeded for name in f['csv_files']],
+            'excel_files': [name for f in succeeded for name in f['excel_files']] + ([workbook] if workbook else []),
+            'output_directory': str(output_dir),
+            'cache': cache_states.pop() if len(cache_states) == 1 else 'partial',
+            'performance': {
+                'processing_time_seconds': round(processing_time, 2),
+                'pages_per_second': round(total_pages / processing_time, 2) if processing_time > 0 else 0,
+                'tables_per_second': round(total_tables / processing_time, 2) if processing_time > 0 else 0,
+                'workers': min(BATCH_WORKERS, len(pending)) if pending else 0,
+                'phases': phases,
+                'pages': pages
+            }
+        }
+
+    except Exception:
+        # Clean up on error
+        if output_dir.exists():
+            shutil.rmtree(output_dir, ignore_errors=True)
+        raise
+
+    finally:
+        shutil.rmtree(upload_dir, ignore_errors=True)
+
+
+_last_cleanup = 0.0
+
+
+def cleanup_expired_jobs():
+    """Delete finished jobs older than JOB_TTL_HOURS, at most once per JOB_CLEANUP_INTERVAL"""
+    global _last_cleanup
+    if JOB_TTL_HOURS <= 0 or time.time() - _last_cleanup < JOB_CLEANUP_INTERVAL:
+        return []
+    _last_cleanup = time.time()
+    removed = job_registry.cleanup(OUTPUT_FOLDER, JOB_TTL_HOURS * 3600, (DONE, FAILED))
+    for job_id in removed:
+        job_queue.forget(job_id)
+    return removed
+
+
+def job_status(job):
+    """Public view of a job (without the internal change counter)"""
+    status = {key: value for key, value in job.items() if key != 'version'}
+    status['status_url'] = f"{router.prefix}/job-status/{job['job_id']}"
+    status['events_url'] = f"{router.prefix}/job-events/{job['job_id']}"
+    return status
+
+
+def new_job_id(name: str) -> str:
+    """Job id: submission time, a random part so same-second uploads never collide, and `name`"""
+    return f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}_{name}"
+
+
+@router.post("/extract-tables")
+async def extract_tables(
+    file: UploadFile = File(...),
+    debug: Optional[str] = Form(None),
+    output_format: Optional[str] = Form('csv'),  # Add this parameter
+    wait: Optional[str] = Form(None)
+):
+    """
+    Submit a PDF for table extraction.
+
+    Returns the job_id immediately (HTTP 202); follow it with /job-status
+    or /job-events. With wait=true the response is held until the job is
+    done and contains the full extraction result, as before.
+    """
+    
+    # Validate file type
+    if not file.filename.endswith('.pdf'):
+        raise HTTPException(status_code=400, detail="Only PDF files are allowed")
+    
+    # Validate output format
+    if output_format not in ['csv', 'excel', 'both']:
+        raise HTTPException(status_code=400, detail="Invalid output format. Must be 'csv', 'excel', or 'both'")
+    
+    # Generate unique job id
+    job_id = new_job_id(file.filename.rsplit('.', 1)[0])
+    
+    # Copy the received upload next to the others, checking its size; the job removes it when done
+    temp_pdf_path = UPLOAD_FOLDER / f"{job_id}.pdf"
+    try:
+        upload = await save_upload(file, temp_pdf_path, MAX_FILE_SIZE, hash_name=UPLOAD_HASH)
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    
+    output_dir = OUTPUT_FOLDER / job_id
+    output_dir.mkdir(parents=True, exist_ok=True)
+    
+    debug_mode = debug and debug.lower() == 'true'
+    job_registry.add(job_id, QUEUED, filename=file.filename, output_format=output_format,
+                     file_size=upload['size'], file_hash=upload['hash'])
+    job = job_queue.submit(
+        job_id,
+        lambda progress: run_extraction(job_id, file.filename, temp_pdf_path, output_dir, output_format,
+                                        debug_mode, progress, file_hash=upload['hash']),
+        filename=file.filename,
+        output_format=output_format,
+        file_size=upload['size'],
+        file_hash=upload['hash']
+    )
+    
+    await asyncio.to_thread(cleanup_expired_jobs)
+    
+    if not (wait and wait.lower() == 'true'):
+        return JSONResponse(status_code=202, content=job_status(job))
+    
+    job = await job_queue.wait(job_id)
+    if job['status'] == FAILED:
+        raise HTTPException(status_code=500, detail=job['error'])
+    return JSONResponse(content=job['result'])
+
+
+@router.post("/extract-batch")
+async def extract_batch(
+    files: List[UploadFile] = File(...),
+    output_format: Optional[str] = Form('csv'),
+    consolidated: Optional[str] = Form(None),
+    wait: Optional[str] = Form(None)
+):
+    """
+    Submit several PDFs (and/or ZIP archives of PDFs) as one extraction job.
+
+    The files are extracted in parallel worker processes; the result lists
+    every file with its own tables, and each file's outputs go into a
+    sub-directory of the job. With consolidated=true, all tables are also
+    gathered into consolidated.xlsx, one sheet per table. Downloads work as
+    for single jobs (/download-all gives everything in one ZIP).
+    """
+    
+    if output_format not in ['csv', 'excel', 'both']:
+        raise HTTPException(status_code=400, detail="Invalid output format. Must be 'csv', 'excel', or 'both'")
+    for file in files:
+        if not file.filename.lower().endswith(('.pdf', '.zip')):
+            raise HTTPException(status_code=400, detail=f"Only PDF and ZIP files are allowed: {file.filename}")
+    
+    job_id = new_job_id(f"batch_{len(files)}_files")
+    upload_dir = UPLOAD_FOLDER / job_id
+    upload_dir.mkdir(parents=True, exist_ok=True)
+    
+    sources = []
+    try:
+        for index, file in enumerate(files):
+            path = upload_dir / f"upload_{index}{Path(file.filename).suffix.lower()}"
+            upload = await save_upload(file, path, MAX_FILE_SIZE, hash_name=UPLOAD_HASH)
+            total_size = sum(source['size'] for source in sources)
+            if path.suffix == '.zip':
+                sources += await asyncio.to_thread(unpack_pdfs, path, upload_dir, MAX_FILE_SIZE, UPLOAD_HASH,
+                                                   max_files=BATCH_MAX_FILES - len(sources),
+                                                   max_total_size=BATCH_MAX_TOTAL_SIZE - total_size)
+                path.unlink()
+            else:
+                if len(sources) >= BATCH_MAX_FILES:
+                    raise TooManyFiles(BATCH_MAX_FILES)
+                if total_size + upload['size'] > BATCH_MAX_TOTAL_SIZE:
+                    raise UploadTooLarge(BATCH_MAX_TOTAL_SIZE, "Batch")
+                sources.append({'filename': file.filename, 'path': path, 'size': upload['size'], 'hash': upload['hash']})
+        if not sources:
+            raise HTTPException(status_code=400, detail="No PDF files found in the upload")
+    except TooManyFiles as e:
+        shutil.rmtree(upload_dir, ignore_errors=True)
+        raise HTTPException(status_code=400, detail=str(e))
+    except UploadTooLarge as e:
+        shutil.rmtree(upload_dir, ignore_errors=True)
+        raise HTTPException(status_code=413, detail=str(e))
+    except zipfile.BadZipFile:
+        shutil.rmtree(upload_dir, ignore_errors=True)
+        raise HTTPException(status_code=400, detail="Invalid ZIP archive")
+    except HTTPException:
+        shutil.rmtree(upload_dir, ignore_errors=True)
+        raise
+    
+    output_dir = OUTPUT_FOLDER / job_id
+    output_dir.mkdir(parents=True, exist_ok=True)
+    
+    consolidated_workbook = consolidated and consolidated.lower() == 'true'
+    filenames = [source['filename'] for source in sources]
+    job_registry.add(job_id, QUEUED, filename=', '.join(filenames), output_format=output_format,
+                     file_size=sum(source['size'] for source in sources))
+    job = job_queue.submit(
+        job_id,
+        lambda progress: run_batch(job_id, sources, upload_dir, output_dir, output_format,
+                                   consolidated_workbook, progress),
+        filename=f"{len(sources)} files",
+        files=filenames,
+        output_format=output_format,
+        file_size=sum(source['size'] for source in sources)
+    )
+    
+    await asyncio.to_thread(cleanup_expired_jobs)
+    
+    if not (wait and wait.lower() == 'true'):
+        return JSONResponse(status_code=202, content=job_status(job))
+    
+    job = await job_queue.wait(job_id)
+    if job['status'] == FAILED:
+        raise HTTPException(status_code=500, detail=job['error'])
+    return JSONResponse(content=job['result'])
+
+
+@router.get("/job-status/{job_id}")
+async def get_job_status(job_id: str):
+    """Status, progress and (once done) the result of an extraction job"""
+    job = job_queue.get(job_id)
+    if job is None:
+        # Finished jobs leave memory after JOB_RETENTION_SECONDS; their summary stays in the registry
+        entry = job_registry.get(job_id)
+        if entry is None:
+            raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+        return {**entry, 'result': None, 'status_url': f"{router.prefix}/job-status/{job_id}"}
+    return job_status(job)
+
+
+@router.get("/job-events/{job_id}")
+async def job_events(job_id: str):
+    """Server-sent events with the job status whenever it changes, until the job is finished"""
+    if job_queue.get(job_id) is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+
+    async def events():
+        version = None
+        while True:
+            job = job_queue.get(job_id)
+            if job is None:
+                return
+            if job['version'] != version:
+                version = job['version']
+                yield f"data: {json.dumps(job_status(job))}\n\n"
+            if job['status'] in (DONE, FAILED):
+                return
+            await asyncio.sleep(JOB_EVENTS_INTERVAL)
+
+    return StreamingResponse(events(), media_type='text/event-stream',
+                             headers={'Cache-Control': 'no-cache'})
+
+
+@router.get("/job-timings/{job_id}")
+async def job_timings(job_id: str, slowest: int = 10):
+    """Debug view of where an extraction spent its time: totals per phase and the slowest pages"""
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    if job['status'] != DONE:
+        raise HTTPException(status_code=409, detail=f"Job {job_id} is {job['status']}")
+    performance = job['result']['performance']
+    if performance['pages'] is None:
+        raise HTTPException(status_code=409, detail=f"Job {job_id} was served from the result cache and has no timings")
+    pages = sorted(performance['pages'], key=lambda page: page['seconds'], reverse=True)
+    return {
+        'job_id': job_id,
+        'cache': job['result']['cache'],
+        'processing_time_seconds': performance['processing_time_seconds'],
+        'pages_processed': len(pages),
+        'phases': performance['phases'],
+        'slowest_pages': pages[:max(0, slowest)]
+    }
 
 
 # Update the download endpoint to handle both CSV and Excel
-@router.get("/download-file/{job_id}/{filename}")
+@router.get("/download-file/{job_id}/{filename:path}")
 async def download_file(job_id: str, filename: str):
-    """Download a specific file (CSV or Excel)"""
+    """Download a specific file (CSV or Excel); batch job files are addressed as <file directory>/<name>"""
     
-    file_path = OUTPUT_FOLDER / job_id / filename
+    job_dir = (OUTPUT_FOLDER / job_id).resolve()
+    file_path = (job_dir / filename).resolve()
     
-    if not file_path.exists():
+    if job_dir not in file_path.parents or not file_path.is_file():
         raise HTTPException(
             status_code=404,
             detail=f"File {filename} not found for job {job_id}"
@@ -667,14 +1116,17 @@ async def download_file(job_id: str, filename: str):
     return FileResponse(
         path=file_path,
         media_type=media_type,
-        filename=filename
+        filename=file_path.name
     )
 
 
 # Update download-all to include both formats
 @router.get("/download-all/{job_id}")
-async def download_all(job_id: str):
-    """Download all files (CSV and/or Excel) as a ZIP"""
+async def download_all(job_id: str, store_xlsx: bool = True):
+    """
+    Download all files (CSV and/or Excel) as a ZIP, generated while it is sent.
+    Excel files are already compressed and are stored as-is unless store_xlsx=false.
+    """
     
     job_dir = OUTPUT_FOLDER / job_id
     
@@ -684,49 +1136,58 @@ async def download_all(job_id: str):
             detail=f"Job {job_id} not found"
         )
     
-    # Create ZIP in memory
-    memory_file = BytesIO()
-    with zipfile.ZipFile(memory_file, 'w', zipfile.ZIP_DEFLATED) as zf:
-        # Add CSV files
-        for csv_file in job_dir.glob('*.csv'):
-            zf.write(csv_file, arcname=csv_file.name)
-        # Add Excel files
-        for excel_file in job_dir.glob('*.xlsx'):
-            zf.write(excel_file, arcname=excel_file.name)
-    
-    memory_file.seek(0)
+    # CSV files first, then Excel files (batch jobs keep each file's outputs in a sub-directory)
+    files = [(csv_file, csv_file.relative_to(job_dir).as_posix()) for csv_file in sorted(job_dir.rglob('*.csv'))]
+    files += [(excel_file, excel_file.relative_to(job_dir).as_posix()) for excel_file in sorted(job_dir.rglob('*.xlsx'))]
     
     return StreamingResponse(
-        memory_file,
+        iter_zip(files, store_compressed=store_xlsx),
         media_type='application/zip',
         headers={'Content-Disposition': f'attachment; filename={job_id}_tables.zip'}
     )
 
 @router.get("/list-jobs")
-async def list_jobs():
-    """List all extraction jobs"""
+async def list_jobs(
+    limit: int = 50,
+    offset: int = 0,
+    status: Optional[str] = None,
+    filename: Optional[str] = None,
+    sort: str = 'submitted_at',
+    order: str = 'desc'
+):
+    """
+    List extraction jobs from the job registry, one page at a time.
+    Filter by status and/or filename (substring), sort by any of
+    submitted_at, finished_at, filename, status, pages, tables, processing_seconds.
+    """
+    
+    if not 1 <= limit <= 1000 or offset < 0:
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 1000 and offset must not be negative")
+    if order not in ['asc', 'desc']:
+        raise HTTPException(status_code=400, detail="Invalid order. Must be 'asc' or 'desc'")
     
-    jobs = []
+    try:
+        total, jobs = await asyncio.to_thread(
+            job_registry.list_jobs, limit=limit, offset=offset, status=status, filename=filename,
+            sort=sort, descending=order == 'desc'
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    if OUTPUT_FOLDER.exists():
-        for job_dir in OUTPUT_FOLDER.iterdir():
-            if job_dir.is_dir():
-                csv_files = [f.name for f in job_dir.glob('*.csv')]
-                jobs.append({
-                    'job_id': job_dir.name,
-                    'csv_count': len(csv_files),
-                    'csv_files': csv_files
-                })
+    for job in jobs:
+        job['csv_count'] = len(job['csv_files'])
     
     return {
-        'total_jobs': len(jobs),
+        'total_jobs': total,
+        'limit': limit,
+        'offset': offset,
         'jobs': jobs
     }
 
 
 @router.delete("/delete-job/{job_id}")
 async def delete_job(job_id: str):
-    """Delete a job and all its files"""
+    """Delete a finished job and all its files (queued and running jobs cannot be deleted)"""
     
     job_dir = OUTPUT_FOLDER / job_id
     
@@ -736,17 +1197,31 @@ async def delete_job(job_id: str):
             detail=f"Job {job_id} not found"
         )
     
+    # The worker would keep writing into the directory (and updating the job) after it is removed
+    if not job_queue.forget(job_id):
+        raise HTTPException(status_code=409, detail=f"Job {job_id} has not finished yet")
+    
     try:
         shutil.rmtree(job_dir)
+        job_registry.remove(job_id)
         return {'success': True, 'message': f'Job {job_id} deleted successfully'}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/cache-stats")
+async def cache_stats():
+    """Size and hit rate of the extraction result cache"""
+    if result_cache is None:
+        return {'enabled': False}
+    return {'enabled': True, **result_cache.stats()}
+
+
 @router.get("/health")
 async def health():
     """Health check endpoint"""
     return {
         'status': 'healthy',
-        'service': 'PDF Table Extractor'
+        'service': 'PDF Table Extractor',
+        'jobs': job_queue.counts()
     }
\ No newline at end of file
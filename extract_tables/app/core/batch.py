@@ -0,0 +1,188 @@
+# app/core/batch.py
+"""
+Batch extraction of many PDFs at once.
+
+The files of a batch are spread over a pool of worker processes, one PDF
+per process at a time, so a product family of datasheets is extracted in
+about the time of its largest file. ZIP uploads are unpacked to plain PDF
+files first, and the tables of all files can be gathered into a single
+workbook with one sheet per table.
+"""
+import csv
+import hashlib
+import multiprocessing
+import os
+import re
+import sys
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import openpyxl
+from openpyxl import Workbook
+
+from app.core.py_pdf_stm.TableExtractor import extract_all_tables_auto, sanitize_filename
+from app.core.uploads import UPLOAD_CHUNK_SIZE, UploadTooLarge
+
+SHEET_TITLE_LENGTH = 31  # Excel limit
+INVALID_SHEET_CHARS = re.compile(r'[\[\]:*?/\\]')
+
+
+class TooManyFiles(Exception):
+    def __init__(self, max_files: int):
+        super().__init__(f"Too many files. Maximum is {max_files} PDFs per batch")
+        self.max_files = max_files
+
+
+def _is_pdf_member(member: zipfile.ZipInfo) -> bool:
+    name = Path(member.filename).name
+    return not member.is_dir() and name.lower().endswith('.pdf') and not name.startswith('._')
+
+
+def unpack_pdfs(zip_path: Path, destination: Path, max_size: int, hash_name: Optional[str] = None,
+                max_files: Optional[int] = None, max_total_size: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Copy the PDF members of a ZIP archive into `destination`.
+
+    The archive's directory is checked against max_files and max_total_size
+    before anything is extracted. Member paths are flattened to their file
+    names (nothing is written outside `destination`) and every member is
+    size-checked while it is copied, whatever size its header claims.
+
+    Returns:
+        list of {'filename', 'path', 'size', 'hash'} dicts
+
+    Raises:
+        zipfile.BadZipFile: not a ZIP archive
+        TooManyFiles: more than max_files PDF members
+        UploadTooLarge: a member is larger than max_size, or all of them together larger than max_total_size
+    """
+    pdfs = []
+    total = 0
+    with zipfile.ZipFile(zip_path) as archive:
+        members = [member for member in archive.infolist() if _is_pdf_member(member)]
+        if max_files is not None and len(members) > max_files:
+            raise TooManyFiles(max_files)
+        if max_total_size is not None and sum(member.file_size for member in members) > max_total_size:
+            raise UploadTooLarge(max_total_size, "Batch")
+        for member in members:
+            name = Path(member.filename).name
+            target = destination / f"{len(pdfs)}_{name}"
+            digest = hashlib.new(hash_name) if hash_name else None
+            size = 0
+            with archive.open(member) as src, open(target, 'wb') as dst:
+                while True:
+                    chunk = src.read(UPLOAD_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    total += len(chunk)
+                    if size > max_size:
+                        error = UploadTooLarge(max_size)
+                    elif max_total_size is not None and total > max_total_size:
+                        error = UploadTooLarge(max_total_size, "Batch")
+                    else:
+                        error = None
+                    if error is not None:
+                        dst.close()
+                        target.unlink()
+                        raise error
+                    if digest is not None:
+                        digest.update(chunk)
+                    dst.write(chunk)
+            pdfs.append({'filename': name, 'path': target, 'size': size,
+                         'hash': digest.hexdigest() if digest is not None else None})
+    return pdfs
+
+
+def extract_file(pdf_path: str, output_directory: str, output_format: str) -> Dict[str, Any]:
+    """extract_all_tables_auto for one file of a batch"""
+    return extract_all_tables_auto(path=pdf_path, output_directory=output_directory, output_format=output_format)
+
+
+def _silence_worker():
+    """Pool initializer: drop the console output of a batch worker process (never of the server itself)"""
+    sys.stdout = open(os.devnull, 'w')
+
+
+def iter_extract_files(jobs: List[Tuple[str, str]], output_format: str,
+                       workers: int = 1) -> Iterator[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]:
+    """
+    Extract (pdf_path, output_directory) pairs, in `workers` processes when
+    workers > 1. Yields (index, results, None) or (index, None, error) per
+    file, in order of completion.
+    """
+    if workers <= 1 or len(jobs) < 2:
+        for index, (pdf_path, output_directory) in enumerate(jobs):
+            try:
+                yield index, extract_file(pdf_path, output_directory, output_format), None
+            except Exception as e:
+                yield index, None, str(e)
+        return
+    # Spawned, not forked: this runs inside the API server's threads
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs)), mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_silence_worker) as executor:
+        futures = {executor.submit(extract_file, pdf_path, output_directory, output_format): index
+                   for index, (pdf_path, output_directory) in enumerate(jobs)}
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result(), None
+            except Exception as e:
+                yield futures[future], None, str(e)
+
+
+def unique_name(name: str, taken: set, max_length: int = 200) -> str:
+    """`name` shortened to max_length, with a numeric suffix if already in `taken` (which it is added to)"""
+    candidate = name[:max_length]
+    number = 2
+    while candidate.lower() in taken:
+        suffix = f"_{number}"
+        candidate = name[:max_length - len(suffix)] + suffix
+        number += 1
+    taken.add(candidate.lower())
+    return candidate
+
+
+def _copy_table(source: Dict[str, Any], sheet):
+    """Fill `sheet` from a table's Excel file (with its merged cells) or, failing that, its CSV file"""
+    if source.get('excel_path') and Path(source['excel_path']).exists():
+        table_sheet = openpyxl.load_workbook(source['excel_path']).active
+        for row in table_sheet.iter_rows(values_only=True):
+            sheet.append(list(row))
+        for merged in table_sheet.merged_cells.ranges:
+            sheet.merge_cells(str(merged))
+        return
+    with open(source['csv_path'], newline='', encoding='utf-8') as f:
+        for row in csv.reader(f):
+            sheet.append(row)
+
+
+def build_consolidated_workbook(tables: List[Dict[str, Any]], destination: Path) -> int:
+    """
+    Write one workbook with a sheet per extracted table, plus an index sheet
+    listing where every table came from.
+
+    Args:
+        tables: 'success' entries of extract_all_tables_auto, each with an added 'source' (file name)
+
+    Returns:
+        Number of table sheets written
+    """
+    wb = Workbook()
+    index = wb.active
+    index.title = "Index"
+    index.append(["Sheet", "Source file", "Page", "Table", "Title"])
+    taken = {"index"}
+    for table in tables:
+        title = INVALID_SHEET_CHARS.sub('', f"{Path(table['source']).stem} {table['title']}").strip("' ")
+        sheet_title = unique_name(title or "Table", taken, SHEET_TITLE_LENGTH)
+        _copy_table(table, wb.create_sheet(sheet_title))
+        index.append([sheet_title, table['source'], table['page'], table['table_number'], table['title']])
+    wb.save(destination)
+    return len(tables)
+
+
+def output_name(filename: str, taken: set) -> str:
+    """Directory name for the outputs of one file of a batch"""
+    return unique_name(sanitize_filename(Path(filename).stem) or "file", taken)
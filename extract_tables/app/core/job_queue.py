@@ -0,0 +1,140 @@
+# app/core/job_queue.py
+"""
+Background job queue for the PDF table extractor API.
+
+Extractions run on a small thread pool so the event loop stays free for
+other requests (uploads, downloads, health checks). Each job records its
+status and progress, which the API exposes for polling and over SSE.
+"""
+import asyncio
+import threading
+import time
+import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class JobQueue:
+    """
+    Runs jobs on `max_concurrent` worker threads.
+
+    A job is a callable taking a `progress(**fields)` function; whatever it
+    returns becomes the job's result, an exception marks it as failed.
+    `on_finish(job)` is called on the worker thread with the final
+    snapshot of every job that is done or failed. Finished jobs are
+    dropped `retention` seconds after they finished (None keeps them);
+    on_finish is where they should be persisted.
+    """
+
+    def __init__(self, max_concurrent: int = 1, on_finish: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 retention: Optional[float] = None):
+        self.max_concurrent = max(1, max_concurrent)
+        self.on_finish = on_finish
+        self.retention = retention
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrent, thread_name_prefix="extraction")
+        self._jobs = {}  # type: Dict[str, Dict[str, Any]]
+        self._futures = {}  # type: Dict[str, Future]
+        self._lock = threading.Lock()
+
+    def submit(self, job_id: str, run: Callable[[Callable[..., None]], Any], **info) -> Dict[str, Any]:
+        """Queue a job; `info` is stored with the job (filename, output format, ...)"""
+        with self._lock:
+            self._evict_finished()
+            self._jobs[job_id] = {
+                'job_id': job_id,
+                'status': QUEUED,
+                'progress': {},
+                'submitted_at': time.time(),
+                'started_at': None,
+                'finished_at': None,
+                'error': None,
+                'result': None,
+                'version': 0,
+                **info
+            }
+            self._futures[job_id] = self._executor.submit(self._run, job_id, run)
+        return self.get(job_id)
+
+    def _update(self, job_id: str, **fields):
+        with self._lock:
+            job = self._jobs[job_id]
+            job.update(fields)
+            job['version'] += 1
+
+    def _run(self, job_id: str, run: Callable[[Callable[..., None]], Any]):
+        self._update(job_id, status=RUNNING, started_at=time.time())
+
+        def progress(**fields):
+            with self._lock:
+                job = self._jobs[job_id]
+                job['progress'] = {**job['progress'], **fields}
+                job['version'] += 1
+
+        try:
+            result = run(progress)
+        except Exception as e:
+            self._update(job_id, status=FAILED, finished_at=time.time(),
+                         error={'error': str(e), 'traceback': traceback.format_exc()})
+            result = None
+        else:
+            self._update(job_id, status=DONE, finished_at=time.time(), result=result)
+        job = self.get(job_id)
+        if self.on_finish is not None:
+            self.on_finish(job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Snapshot of a job, or None if unknown"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            return {**job, 'progress': dict(job['progress'])}
+
+    async def wait(self, job_id: str) -> Dict[str, Any]:
+        """
+        Wait for a job to finish without blocking the event loop; returns its
+        final snapshot even if the job has been evicted since.
+
+        Raises:
+            KeyError: unknown job
+        """
+        with self._lock:
+            future = self._futures[job_id]
+        return await asyncio.wrap_future(future)
+
+    def _evict_finished(self):
+        """Drop jobs that finished more than `retention` seconds ago (called with the lock held)"""
+        if self.retention is None:
+            return
+        cutoff = time.time() - self.retention
+        for job_id in [job_id for job_id, job in self._jobs.items()
+                       if job['finished_at'] is not None and job['finished_at'] < cutoff]:
+            del self._jobs[job_id]
+            del self._futures[job_id]
+
+    def forget(self, job_id: str) -> bool:
+        """
+        Drop a finished (or unknown) job. Queued and running jobs are kept,
+        their worker still needs them: returns False for those.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and job['status'] in (QUEUED, RUNNING):
+                return False
+            self._jobs.pop(job_id, None)
+            self._futures.pop(job_id, None)
+        return True
+
+    def counts(self) -> Dict[str, int]:
+        counts = {QUEUED: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+        with self._lock:
+            self._evict_finished()
+            for job in self._jobs.values():
+                counts[job['status']] += 1
+        return counts
@@ -0,0 +1,168 @@
+# app/core/job_registry.py
+"""
+Persistent index of extraction jobs.
+
+Every job gets a row when it is submitted and the row is completed when
+the job finishes (status, timing, page/table counts, output files). Job
+listings are paginated queries on this SQLite table instead of a scan of
+the outputs directory, and jobs older than a TTL can be found (and their
+directories removed) without touching the rest of the tree.
+"""
+import json
+import shutil
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Columns /list-jobs may sort on
+SORT_COLUMNS = ('submitted_at', 'finished_at', 'filename', 'status', 'pages', 'tables', 'processing_seconds')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    filename TEXT,
+    output_format TEXT,
+    status TEXT NOT NULL,
+    submitted_at REAL NOT NULL,
+    finished_at REAL,
+    file_size INTEGER,
+    file_hash TEXT,
+    pages INTEGER,
+    tables INTEGER,
+    processing_seconds REAL,
+    cache TEXT,
+    error TEXT,
+    csv_files TEXT NOT NULL DEFAULT '[]',
+    excel_files TEXT NOT NULL DEFAULT '[]'
+);
+CREATE INDEX IF NOT EXISTS jobs_submitted_at ON jobs (submitted_at);
+CREATE INDEX IF NOT EXISTS jobs_status_submitted_at ON jobs (status, submitted_at);
+"""
+
+
+class JobRegistry:
+    """
+    Job metadata in a SQLite database at `path`.
+
+    A single connection is shared by the API handlers and the job worker
+    threads, serialised by a lock; every call is one short statement.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        is_new = not self.path.exists()
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        self.is_new = is_new
+
+    def _execute(self, sql: str, params=()) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    def add(self, job_id: str, status: str, submitted_at: Optional[float] = None, **fields):
+        """Record a submitted job; `fields` are column values (filename, output_format, file_size, ...)"""
+        row = {'job_id': job_id, 'status': status, 'submitted_at': submitted_at or time.time(), **fields}
+        for key in ('csv_files', 'excel_files'):
+            if key in row:
+                row[key] = json.dumps(row[key])
+        columns = ', '.join(row)
+        placeholders = ', '.join('?' for _ in row)
+        self._execute(f"INSERT OR REPLACE INTO jobs ({columns}) VALUES ({placeholders})", tuple(row.values()))
+
+    def update(self, job_id: str, **fields):
+        """Set columns of an existing job (status, finished_at, pages, csv_files, ...)"""
+        for key in ('csv_files', 'excel_files'):
+            if key in fields:
+                fields[key] = json.dumps(fields[key])
+        assignments = ', '.join(f"{key} = ?" for key in fields)
+        self._execute(f"UPDATE jobs SET {assignments} WHERE job_id = ?", (*fields.values(), job_id))
+
+    def remove(self, job_id: str):
+        self._execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        for key in ('csv_files', 'excel_files'):
+            job[key] = json.loads(job[key])
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        rows = self._execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,))
+        return self._to_dict(rows[0]) if rows else None
+
+    def list_jobs(self, limit: int = 50, offset: int = 0, status: Optional[str] = None, filename: Optional[str] = None,
+                  sort: str = 'submitted_at', descending: bool = True) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        One page of jobs.
+
+        Args:
+            limit, offset: Page to return
+            status: Only jobs with this status
+            filename: Only jobs whose filename contains this text
+            sort: One of SORT_COLUMNS
+            descending: Newest / largest first
+
+        Returns:
+            (number of jobs matching the filters, jobs on the page)
+        """
+        if sort not in SORT_COLUMNS:
+            raise ValueError(f"Cannot sort by {sort!r}. Must be one of {', '.join(SORT_COLUMNS)}")
+        conditions, params = [], []
+        if status:
+            conditions.append("status = ?")
+            params.append(status)
+        if filename:
+            conditions.append("filename LIKE ? ESCAPE '\\'")
+            escaped = filename.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            params.append(f"%{escaped}%")
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        order = 'DESC' if descending else 'ASC'
+        with self._lock:
+            total = self._db.execute(f"SELECT COUNT(*) FROM jobs {where}", params).fetchone()[0]
+            rows = self._db.execute(
+                f"SELECT * FROM jobs {where} ORDER BY {sort} {order}, job_id {order} LIMIT ? OFFSET ?",
+                (*params, limit, offset)
+            ).fetchall()
+        return total, [self._to_dict(row) for row in rows]
+
+    def mark_interrupted(self, statuses: Tuple[str, ...], status: str, error: str):
+        """Close out jobs left unfinished by a previous run of the server"""
+        placeholders = ', '.join('?' for _ in statuses)
+        self._execute(f"UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE status IN ({placeholders})",
+                      (status, error, time.time(), *statuses))
+
+    def import_directories(self, output_folder: Path, status: str):
+        """Register job directories that predate the registry (done once, when the database is created)"""
+        for job_dir in output_folder.iterdir():
+            if job_dir.is_dir() and self.get(job_dir.name) is None:
+                self.add(job_dir.name, status, submitted_at=job_dir.stat().st_mtime,
+                         csv_files=sorted(f.name for f in job_dir.glob('*.csv')),
+                         excel_files=sorted(f.name for f in job_dir.glob('*.xlsx')))
+
+    def cleanup(self, output_folder: Path, max_age: float, statuses: Tuple[str, ...]) -> List[str]:
+        """
+        Delete the directories and rows of jobs in `statuses` submitted more
+        than `max_age` seconds ago. Returns the removed job ids.
+        """
+        placeholders = ', '.join('?' for _ in statuses)
+        rows = self._execute(
+            f"SELECT job_id FROM jobs WHERE submitted_at < ? AND status IN ({placeholders})",
+            (time.time() - max_age, *statuses)
+        )
+        removed = []
+        for row in rows:
+            shutil.rmtree(output_folder / row['job_id'], ignore_errors=True)
+            self.remove(row['job_id'])
+            removed.append(row['job_id'])
+        return removed
+
+    def close(self):
+        with self._lock:
+            self._db.close()
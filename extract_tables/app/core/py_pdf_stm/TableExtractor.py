@@ -1,66 +1,89 @@
 import math
+import multiprocessing
+import time
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+from itertools import islice
 from operator import itemgetter
 import csv
 import pdfplumber
 from PIL import ImageDraw, ImageFont, Image
+from pdfplumber.page import test_proposed_bbox
 from pdfplumber.table import TableFinder
+from pdfplumber.utils import chars_to_textmap, within_bbox
 import os
 from pathlib import Path
 from .DataSheetParsers.DataSheet import *
+from .Telemetry import PageTelemetry, get_telemetry, use_telemetry
 import re
+import numpy as np
 import openpyxl
 from openpyxl import Workbook
 from openpyxl.utils import get_column_letter
+from typing import Dict, List, Set, Tuple
+
+# Bump whenever the extracted output changes; cached extraction results are keyed on it
+EXTRACTOR_VERSION = "3"
+
+# Pages submitted per worker ahead of the page being consumed, with workers > 1 (see iter_page_tables)
+PAGES_IN_FLIGHT_PER_WORKER = 2
 
 def almost_equals(num1, num2, precision=5.0):
     return abs(num1 - num2) < precision
 
 
 class Point:
+    __slots__ = ('x', 'y', 'down', 'up', 'left', 'right', '_hash')
+
     r = 4
     hr = r / 2
     tail = 5
 
+    # (up, down, right, left) -> symbol
+    direction_table = {
+        (False, False, False, False): '◦',
+
+        (True, False, False, False): '↑',
+        (False, True, False, False): '↓',
+        (True, True, False, False): '↕',
+
+        (True, True, True, False): '⊢',
+        (True, True, False, True): '⊣',
+
+        (False, False, True, False): '→',
+        (False, False, False, True): '←',
+        (False, False, True, True): '↔',
+
+        (True, False, True, True): '⊥',
+        (False, True, True, True): '⊤',
+
+        (True, True, True, True): '╋',
+
+        (True, False, True, False): '┗',
+        (True, False, False, True): '┛',
+
+        (False, True, True, False): '┏',
+        (False, True, False, True): '┛',
+
+    }
+
     def __init__(self, *xy):
         if len(xy) == 1:
             xy = xy[0]
-        self.x, self.y = xy
-        self.x = math.ceil(self.x)
-        self.y = math.ceil(self.y)
+        x, y = xy
+        self.x = math.ceil(x)
+        self.y = math.ceil(y)
         self.down = False
         self.up = False
         self.left = False
         self.right = False
+        # Coordinates never change after construction
+        self._hash = hash((self.x, self.y))
 
     @property
     def symbol(self):
-        direction_table = {
-            (False, False, False, False): '◦',
-
-            (True, False, False, False): '↑',
-            (False, True, False, False): '↓',
-            (True, True, False, False): '↕',
-
-            (True, True, True, False): '⊢',
-            (True, True, False, True): '⊣',
-
-            (False, False, True, False): '→',
-            (False, False, False, True): '←',
-            (False, False, True, True): '↔',
-
-            (True, False, True, True): '⊥',
-            (False, True, True, True): '⊤',
-
-            (True, True, True, True): '╋',
-
-            (True, False, True, False): '┗',
-            (True, False, False, True): '┛',
-
-            (False, True, True, False): '┏',
-            (False, True, False, True): '┛',
-
-        }
-        return direction_table[(self.up, self.down, self.right, self.left)]
+        return self.direction_table[(self.up, self.down, self.right, self.left)]
 
     def __repr__(self):
         return "Point<X:{} Y:{}>".format(self.x, self.y)
@@ -141,6 +164,9 @@ class Point:
             return True
         return False
 
+    def set_all_directions(self):
+        self.down = self.up = self.left = self.right = True
+
     def copy(self, other: 'Point'):
         self.down = other.down
         self.up = other.up
@@ -159,10 +185,156 @@ class Point:
         return almost_equals(self.y, other.y)
 
     def __hash__(self):
-        return hash((self.x, self.y))
+        return self._hash
+
+
+class PointIndex:
+    """
+    Skeleton points keyed by their rounded coordinates.
+
+    Points are also bucketed on a grid the size of the almost_equals tolerance,
+    so finding every point "equal" to a new one only looks at the 3x3
+    neighbouring buckets instead of scanning the whole point list. The order in
+    which each coordinate was first added is kept, so ordered() matches the
+    point list the previous list-scanning implementation produced.
+    """
+    size = 5
+
+    def __init__(self):
+        self.points = {}  # type: Dict[Tuple[int, int], Point]
+        self.first_seen = {}  # type: Dict[Tuple[int, int], int]
+        self.grid = {}  # type: Dict[Tuple[int, int], Set[Tuple[int, int]]]
+        self._counter = 0
+
+    def _bucket(self, x, y):
+        return x // self.size, y // self.size
+
+    def _insert(self, key: Tuple[int, int], point: 'Point', first_seen: int):
+        self.points[key] = point
+        self.first_seen[key] = first_seen
+        self.grid.setdefault(self._bucket(*key), set()).add(key)
+
+    def add(self, point: 'Point'):
+        """Add a point unless one with the exact same coordinates is already indexed"""
+        self._counter += 1
+        key = point.as_tuple
+        if key not in self.points:
+            self._insert(key, point, self._counter)
+
+    def remove(self, key: Tuple[int, int]):
+        del self.points[key]
+        del self.first_seen[key]
+        bucket = self.grid[self._bucket(*key)]
+        bucket.discard(key)
+        if not bucket:
+            del self.grid[self._bucket(*key)]
+
+    def near(self, point: 'Point'):
+        """Coordinates of indexed points almost equal to point"""
+        x, y = point.as_tuple
+        bx, by = self._bucket(x, y)
+        for gx in (bx - 1, bx, bx + 1):
+            for gy in (by - 1, by, by + 1):
+                for key in self.grid.get((gx, gy), ()):
+                    if almost_equals(key[0], x) and almost_equals(key[1], y):
+                        yield key
+
+    def snap(self, point: 'Point'):
+        """Replace every indexed point almost equal to point by point itself"""
+        self._counter += 1
+        merged = list(self.near(point))
+        first_seen = min((self.first_seen[key] for key in merged), default=self._counter)
+        for key in merged:
+            self.remove(key)
+        self._insert(point.as_tuple, point, first_seen)
+
+    def ordered(self) -> List['Point']:
+        """Indexed points in the order their coordinates first appeared"""
+        return [self.points[key] for key in sorted(self.points, key=self.first_seen.__getitem__)]
+
+
+class PointGrid:
+    """
+    Row/column index over a point list, answering Point.get_right and
+    Point.get_bottom queries with bisect lookups instead of full scans.
+
+    Points are bucketed by y and sorted by x (rows), and bucketed by x and
+    sorted by y (columns). Ties keep their position in the original list, so
+    the answers are exactly those of the list-scanning methods.
+    """
+
+    def __init__(self, points: List['Point'], precision=5.0):
+        self.precision = precision
+        self.rows, self.row_keys = self._bucket(points, lambda p: p.y, lambda p: p.x)
+        self.cols, self.col_keys = self._bucket(points, lambda p: p.x, lambda p: p.y)
+
+    @staticmethod
+    def _bucket(points, across, along):
+        buckets = {}
+        for order, point in enumerate(points):
+            buckets.setdefault(across(point), []).append((along(point), order, point))
+        for key, entries in buckets.items():
+            entries.sort(key=itemgetter(0, 1))
+            buckets[key] = ([entry[0] for entry in entries], entries)
+        return buckets, sorted(buckets)
+
+    def _first(self, buckets, keys, across, along, accept):
+        """First point (by along coordinate, then list position) past `along` whose bucket is almost `across`"""
+        best = None
+        lo = bisect_right(keys, across - self.precision)
+        hi = bisect_left(keys, across + self.precision)
+        for key in keys[lo:hi]:
+            coords, entries = buckets[key]
+            for entry in entries[bisect_right(coords, along):]:
+                if best is not None and entry[:2] > best[:2]:
+                    break
+                if accept(entry[2]):
+                    best = entry
+                    break
+        return best[2] if best else None
+
+    def get_right(self, point: 'Point'):
+        """Same result as point.get_right(points)"""
+        return self._first(self.rows, self.row_keys, point.y, point.x,
+                           lambda other: other.down and other != point)
+
+    def get_bottom(self, point: 'Point', left=False, right=False):
+        """Same result as point.get_bottom(points, left, right)"""
+        return self._first(self.cols, self.col_keys, point.x, point.y,
+                           lambda other: other.up and (not left or other.right) and (not right or other.left)
+                           and other != point)
+
+
+class CellIndex:
+    """
+    Cells bucketed by the grid cell of each corner, so checking whether an
+    equal cell (in any corner rotation) was already added only compares cells
+    sharing a corner with it.
+    """
+    size = 5
+
+    def __init__(self):
+        self.buckets = {}  # type: Dict[Tuple[int, int], List[Cell]]
+
+    def _bucket(self, point: 'Point'):
+        return point.x // self.size, point.y // self.size
+
+    def __contains__(self, cell: 'Cell'):
+        bx, by = self._bucket(cell.p1)
+        for gx in (bx - 1, bx, bx + 1):
+            for gy in (by - 1, by, by + 1):
+                for other in self.buckets.get((gx, gy), ()):
+                    if cell == other:
+                        return True
+        return False
+
+    def add(self, cell: 'Cell'):
+        for bucket in {self._bucket(p) for p in (cell.p1, cell.p2, cell.p3, cell.p4)}:
+            self.buckets.setdefault(bucket, []).append(cell)
 
 
 class Line:
+    __slots__ = ('p1', 'p2', 'vertical', '_hash')
 
     def __init__(self, p1: 'Point', p2: 'Point'):
         self.p1 = p1
@@ -185,9 +357,10 @@ class Line:
         else:
             self.p1.right = True
             self.p2.left = True
+        self._hash = hash((self.p1, self.p2, self.vertical))
 
     def __hash__(self):
-        return hash((self.p1, self.p2, self.vertical))
+        return self._hash
 
     @property
     def x(self):
@@ -222,6 +395,23 @@ class Line:
     def as_tuple(self):
         return (self.x, self.y), (self.cx, self.cy)
 
+    @property
+    def key(self) -> Tuple[int, int, int, int]:
+        """Endpoint-ordered integer coordinates identifying the segment"""
+        return self.p1.x, self.p1.y, self.p2.x, self.p2.y
+
+    @property
+    def axis_key(self) -> Tuple[bool, int]:
+        """Lines with equal axis keys are on the same line (see on_same_line)"""
+        return self.vertical, self.x if self.vertical else self.y
+
+    @property
+    def span(self) -> Tuple[int, int]:
+        """Start and end of the segment along its own direction"""
+        if self.vertical:
+            return self.p1.y, self.p2.y
+        return self.p1.x, self.p2.x
+
     def infite_intersect(self, other: 'Line'):
         line1 = self.as_tuple
         line2 = other.as_tuple
@@ -402,6 +592,8 @@ class Cell:
         |       |
        P4-------P3
     """
+    __slots__ = ('p1', 'p2', 'p3', 'p4', 'text', 'words')
+
     try:
         font = ImageFont.truetype('arial', size=9)
     except:
@@ -493,6 +685,21 @@ class Cell:
         return x1 < x < x2 and y1 < y < y2
 
 
+def cell_rects(cells: List['Cell']) -> np.ndarray:
+    """(N, 4) array of the (x1, y1, x3, y3) corners of each cell"""
+    return np.array([(c.p1.x, c.p1.y, c.p3.x, c.p3.y) for c in cells], dtype=float).reshape(-1, 4)
+
+
+def points_in_rects(points: np.ndarray, rects: np.ndarray) -> np.ndarray:
+    """
+    (M, N) mask of which of M points lie strictly inside which of N rects,
+    with the same edge handling as Cell.point_inside_polygon.
+    """
+    x = points[:, 0:1]
+    y = points[:, 1:2]
+    return (rects[:, 0] < x) & (x < rects[:, 2]) & (rects[:, 1] < y) & (y < rects[:, 3])
+
+
 class Table:
 
     def __init__(self, cells: List[Cell], skeleton: List[List[Cell]], ugly_table: List[List[str]], words, canvas=None):
@@ -514,97 +721,81 @@ class Table:
                     cell = self.global_map[row_id][col_id]
                     row_data.append(cell.text.strip())
                 writer.writerow(row_data)
+
     def to_excel(self, filename):
+        """
+        Export table to Excel, merging the cells that span several positions.
+
+        The sheet is streamed row by row (openpyxl write-only mode) and the
+        spans are found in the same single pass over global_map.
+        """
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet()
+
+        # Bounding box (min_row, min_col, max_row, max_col) of every distinct cell object
+        spans = {}
+        for row_id, row in self.global_map.items():
+            for col_id, cell in row.items():
+                span = spans.get(id(cell))
+                if span is None:
+                    spans[id(cell)] = [row_id, col_id, row_id, col_id]
+                else:
+                    span[0] = min(span[0], row_id)
+                    span[1] = min(span[1], col_id)
+                    span[2] = max(span[2], row_id)
+                    span[3] = max(span[3], col_id)
+
+        # Only the top-left cell of a merged range keeps its value
+        covered = set()
+        for min_row, min_col, max_row, max_col in spans.values():
+            if (min_row, min_col) == (max_row, max_col):
+                continue
+            # Excel uses 1-based indexing
+            ws.merged_cells.add(f'{get_column_letter(min_col + 1)}{min_row + 1}:'
+                                f'{get_column_letter(max_col + 1)}{max_row + 1}')
+            covered.update((r_id, c_id) for r_id in range(min_row, max_row + 1)
+                           for c_id in range(min_col, max_col + 1) if (r_id, c_id) != (min_row, min_col))
 
-        # Create a new workbook and select the active sheet
-        wb = Workbook()
-        ws = wb.active
-        
-        # First, determine the actual table dimensions
         max_row = max(self.global_map.keys()) if self.global_map else 0
-        max_col = 0
-        for row_data in self.global_map.values():
-            if row_data:
-                max_col = max(max_col, max(row_data.keys()))
-        
-        # Track which cells we've already processed
-        processed_cells = set()
-        
-        # First pass: Write all cell values
-        for row_id in range(max_row + 1):
-            for col_id in range(max_col + 1):
-                if row_id in self.global_map and col_id in self.global_map[row_id]:
-                    cell = self.global_map[row_id][col_id]
-                    # Excel uses 1-based indexing
-                    excel_row = row_id + 1
-                    excel_col = col_id + 1
-                    # Write the cell value
-                    ws.cell(row=excel_row, column=excel_col, value=cell.text.strip())
-        
-        # Second pass: Merge cells
         for row_id in range(max_row + 1):
-            for col_id in range(max_col + 1):
-                if row_id in self.global_map and col_id in self.global_map[row_id]:
-                    cell = self.global_map[row_id][col_id]
-                    cell_obj_id = id(cell)
-                    
-                    # Skip if we've already processed this cell object
-                    if cell_obj_id in processed_cells:
-                        continue
-                    
-                    # Find all positions this cell spans
-                    positions = []
-                    for r_id in range(max_row + 1):
-                        for c_id in range(max_col + 1):
-                            if (r_id in self.global_map and 
-                                c_id in self.global_map[r_id] and 
-                                id(self.global_map[r_id][c_id]) == cell_obj_id):
-                                positions.append((r_id, c_id))
-                    
-                    if len(positions) > 1:
-                        # Sort positions to find top-left and bottom-right
-                        min_row = min(pos[0] for pos in positions)
-                        max_row_span = max(pos[0] for pos in positions)
-                        min_col = min(pos[1] for pos in positions)
-                        max_col_span = max(pos[1] for pos in positions)
-                        
-                        # Excel uses 1-based indexing
-                        start_row = min_row + 1
-                        start_col = min_col + 1
-                        end_row = max_row_span + 1
-                        end_col = max_col_span + 1
-                        
-                        # Create cell range string
-                        start_cell = get_column_letter(start_col) + str(start_row)
-                        end_cell = get_column_letter(end_col) + str(end_row)
-                        
-                        # Merge the cells
-                        ws.merge_cells(f'{start_cell}:{end_cell}')
-                    
-                    # Mark this cell as processed
-                    processed_cells.add(cell_obj_id)
-        
+            row = self.global_map.get(row_id, {})
+            values = [None] * (max(row.keys()) + 1 if row else 0)
+            for col_id, cell in row.items():
+                if (row_id, col_id) not in covered:
+                    values[col_id] = cell.text.strip()
+            ws.append(values)
+
         # Save the workbook
         wb.save(filename)
-        print(f"Saved Excel file with merged cells: {filename}")
 
     def build_table(self):
+        rects = cell_rects(self.cells)
+
+        # Skeleton cell centers -> table cells containing them (last match wins the map slot)
+        positions = []
         for y, (text_row, skeleton_row) in enumerate(zip(self.ugly_table, self.skeleton)):
             self.global_map[y] = {}
             for x, (text, cell) in enumerate(zip(text_row, skeleton_row)):
-                for t_cell in self.cells:
-                    if t_cell.point_inside_polygon(cell.center):
-                        t_cell.text += text if text else ''
-                        self.global_map[y][x] = t_cell
-
-        processed_cells = []
-        for cell in tqdm(self.cells, desc='Analyzing cells', unit='cells'):
+                positions.append((y, x, text, cell.center.as_tuple))
+        centers = np.array([position[3] for position in positions], dtype=float).reshape(-1, 2)
+        for (y, x, text, _), inside in zip(positions, points_in_rects(centers, rects)):
+            for i in np.flatnonzero(inside):
+                t_cell = self.cells[i]
+                t_cell.text += text if text else ''
+                self.global_map[y][x] = t_cell
+
+        # Words are assigned by their origin; cells equal to an earlier one keep no words
+        unique_cells = []
+        processed_cells = CellIndex()
+        for cell in self.cells:
             if cell in processed_cells:
                 continue
-            in_words = list(filter(lambda char: cell.point_inside_polygon(
-                Point(char['x0'], char['top'])), self.words))
-            cell.words = in_words
-            processed_cells.append(cell)
+            processed_cells.add(cell)
+            unique_cells.append(cell)
+        origins = np.ceil(np.array([(word['x0'], word['top']) for word in self.words], dtype=float).reshape(-1, 2))
+        inside = points_in_rects(origins, cell_rects(unique_cells)).T
+        for cell, cell_inside in zip(unique_cells, inside):
+            cell.words = [self.words[i] for i in np.flatnonzero(cell_inside)]
 
         if self.canvas:
             for cell in self.cells:
@@ -637,6 +828,40 @@ class Table:
         return row_span, col_span
 
 
+class PageContext:
+    """
+    Per-page data shared by every table on a page and by the title searches
+    above them: words are extracted once, and title text is read from the
+    page's chars without cropping every object on the page. close()
+    releases pdfplumber's cached page objects once the page is done.
+    """
+
+    def __init__(self, page):
+        self.page = page
+        self._words = None
+
+    @property
+    def words(self):
+        if self._words is None:
+            self._words = self.page.extract_words()
+        return self._words
+
+    @property
+    def chars(self):
+        return self.page.chars
+
+    def text_within(self, bbox) -> str:
+        """Same text as page.within_bbox(bbox).extract_text()"""
+        test_proposed_bbox(bbox, self.page.bbox)
+        x0, top, x1, bottom = bbox
+        return chars_to_textmap(within_bbox(self.chars, bbox), layout_bbox=bbox,
+                                layout_width=x1 - x0, layout_height=bottom - top).as_string
+
+    def close(self):
+        self._words = None
+        self.page.close()
+
+
 class TableExtractor:
 
     def __init__(self, path):
@@ -644,16 +869,39 @@ class TableExtractor:
         self.draw = False
         self.debug = False
 
+    @staticmethod
+    def merge_collinear(segments: List[Line], precision=3.0) -> List[Line]:
+        """Merge segments on the same line that overlap or touch (within precision) into single lines"""
+        segments = sorted(segments, key=lambda l: l.span)
+        merged = []
+        start, end = segments[0], segments[0]
+        for segment in segments[1:]:
+            if segment.span[0] - end.span[1] <= precision:
+                if segment.span[1] > end.span[1]:
+                    end = segment
+                continue
+            merged.append(start if start is end else Line(start.p1, end.p2))
+            start, end = segment, segment
+        merged.append(start if start is end else Line(start.p1, end.p2))
+        return merged
+
     @staticmethod
     def filter_lines(lines: List[Line]):
+        """
+        Deduplicate the cell edges: exact duplicates are dropped by endpoint
+        key and overlapping or touching segments on the same x (vertical) or
+        y (horizontal) are merged. Separate segments of an axis are all kept,
+        since their ends are the corners of spanned cells.
+        """
+        unique = {}  # type: Dict[Tuple[int, int, int, int], Line]
+        for line in lines:
+            unique.setdefault(line.key, line)
+        by_axis = {}  # type: Dict[Tuple[bool, int], List[Line]]
+        for line in unique.values():
+            by_axis.setdefault(line.axis_key, []).append(line)
         new_lines = []
-        lines = list(set(lines))
-        la = new_lines.append
-        for line1 in tqdm(lines, desc='Filtering lines', unit='lines'):
-            if line1 in new_lines:
-                continue
-            la(line1)
-        new_lines = list(set(new_lines))
+        for segments in by_axis.values():
+            new_lines.extend(TableExtractor.merge_collinear(segments))
         return new_lines
 
     @staticmethod
@@ -662,49 +910,52 @@ class TableExtractor:
         points.append(line.p2)
 
     def build_skeleton(self, lines):
-        skeleton_points = []
         skeleton = []
-        temp_point = Point(0, 0)
-        temp_point.down = temp_point.up = temp_point.left = temp_point.right = True
         vertical = list(filter(lambda l: l.vertical, lines))
         horizontal = list(filter(lambda l: not l.vertical, lines))
-        
-        for line1 in tqdm(vertical, desc='Building table skeleton', unit='lines'):
-            sys.stdout.flush()
+        index = PointIndex()
+        # Endpoints added since the last intersection. Every point added before an
+        # intersection ends up fully connected; the ones added after the last one
+        # keep the directions of their own line.
+        unconnected = []
+
+        for line1 in vertical:
             if line1.length < 3.0:
                 continue
-            self.add_skeleton_points(skeleton_points, line1)
-            
+            index.add(line1.p1)
+            index.add(line1.p2)
+            unconnected += (line1.p1, line1.p2)
+
             for line2 in horizontal:
-                if line1 == line2:
-                    continue
-                self.add_skeleton_points(skeleton_points, line2)
-                
+                index.add(line2.p1)
+                index.add(line2.p2)
+                unconnected += (line2.p1, line2.p2)
+
                 # Check if intersection exists before creating Point
                 intersection = line1.infite_intersect(line2)
-                if intersection and intersection[0] is not None and intersection[1] is not None:
-                    p1 = Point(intersection)
-                    if p1 not in skeleton_points:
-                        skeleton_points.append(p1)
-
-                    for n, p in enumerate(skeleton_points):
-                        skeleton_points[n].copy(temp_point)
-                        if p == p1:
-                            p1.copy(p)
-                            skeleton_points[n] = p1
-        
-        skeleton_points = list(set(skeleton_points))
+                if intersection[0] is not None and intersection[1] is not None:
+                    point = Point(intersection)
+                    point.set_all_directions()
+                    for other in unconnected:
+                        other.set_all_directions()
+                    unconnected.clear()
+                    index.snap(point)
+
+        skeleton_points = list(set(index.ordered()))
         sorted_y_points = sorted(skeleton_points, key=lambda other: other.y)
-        
-        for p1 in tqdm(sorted_y_points, desc='Building skeleton cells', unit='point'):
-            p2 = p1.get_right(skeleton_points)
+        grid = PointGrid(skeleton_points)
+        added_cells = CellIndex()
+
+        for p1 in sorted_y_points:
+            p2 = grid.get_right(p1)
             if p2:
-                p3 = p2.get_bottom(skeleton_points, right=True)
-                p4 = p1.get_bottom(skeleton_points, left=True)
+                p3 = grid.get_bottom(p2, right=True)
+                p4 = grid.get_bottom(p1, left=True)
                 if p3 and p4:
                     cell = Cell(p1, p2, p3, p4)
-                    if cell not in skeleton:
+                    if cell not in added_cells:
                         skeleton.append(cell)
+                        added_cells.add(cell)
                     else:
                         continue
         
@@ -712,24 +963,41 @@ class TableExtractor:
 
     @staticmethod
     def skeleton_to_2d_table(skeleton: List[Cell]) -> List[List[Cell]]:
+        """
+        Group skeleton cells into rows of cells on the same row, top to bottom,
+        each row sorted left to right. A single sort followed by a sweep over
+        adjacent cells; the sort is stable, so cells at the same x keep their
+        skeleton order.
+        """
         rows = []
-        for cell in tqdm(skeleton, desc='Analyzing cell positions', unit='cells'):
-            row = tuple(sorted(filter(lambda c: cell.on_same_row(c), skeleton), key=lambda c: c.p1.x))
-            rows.append(row)
-        rows = list(sorted(list(set(rows)), key=lambda c: c[0].p1.y))
-        rows = [list(row) for row in rows]
+        ordered = sorted(skeleton, key=lambda c: (c.p1.y, c.p1.x))
+        for cell in ordered:
+            if rows and rows[-1][0].on_same_row(cell):
+                rows[-1].append(cell)
+            else:
+                rows.append([cell])
         return rows
 
-    def parse_page(self, page_n):
+    def parse_page(self, page_n, context: PageContext = None):
+        """
+        Parse the tables on a page. Without a context, one is created for
+        the page and closed when the page is done.
+        """
         if self.debug:
             print('Parsing page', page_n)
-        page = self.pdf.pages[page_n]
+        telemetry = get_telemetry()
+        owns_context = context is None
+        if owns_context:
+            context = PageContext(self.pdf.pages[page_n])
+        page = context.page
         if self.debug:
             print('Rendering page')
 
         if self.debug:
             print('Finding tables')
-        tables = TableFinder(page, {'snap_tolerance': 3, 'join_tolerance': 3})
+        with telemetry.phase('find_tables') as phase:
+            tables = TableFinder(page, {'snap_tolerance': 3, 'join_tolerance': 3})
+            phase['tables'] = len(tables.tables)
         if self.debug:
             print('Found', len(tables.tables), 'tables')
         beaut_tables = []
@@ -738,16 +1006,20 @@ class TableExtractor:
             p_im.draw_lines(page.lines)
             p_im.save('page-{}-lines.png'.format(page_n + 1))
         if len(tables.tables) > 5:
+            if owns_context:
+                context.close()
             return []
         for n, table in enumerate(tables.tables):
             if self.draw:
                 p_im.reset()
                 im = Image.new('RGB', (int(page.width), int(page.height)), (255,) * 3)
                 canvas = ImageDraw.ImageDraw(im)
-            ugly_table = table.extract()
+            with telemetry.phase('extract_table_text'):
+                ugly_table = table.extract()
             lines = []  # type: List[Line]
             cells = []  # type: List[Cell]
-            for cell in tqdm(table.cells, desc='Parsing cells', unit='cells'):
+            parse_start = time.perf_counter()
+            for cell in table.cells:
                 # p_im.draw_rect(cell)
                 x1, y1, x2, y2 = cell
                 p1 = Point(x1, y1)
@@ -772,25 +1044,33 @@ class TableExtractor:
                 lines.append(line4)
                 cell = Cell(p1, p2, p3, p4)
                 cells.append(cell)
+            telemetry.record('parse_cells', time.perf_counter() - parse_start, cells=len(cells))
 
             # for line in lines:
             #     p_im.draw_line(line.as_tuple)
-            lines = self.filter_lines(lines)
+            with telemetry.phase('filter_lines', lines_in=len(lines)) as phase:
+                lines = self.filter_lines(lines)
+                phase['lines_out'] = len(lines)
             # for line in lines:
             #     line.draw(canvas, color='green')
             if self.draw:
                 p_im.save('page-{}-{}_im.png'.format(page_n + 1, n))
                 im.save('page-{}-{}.png'.format(page_n + 1, n))
-            skeleton_points, skeleton = self.build_skeleton(lines.copy())
+            with telemetry.phase('build_skeleton') as phase:
+                skeleton_points, skeleton = self.build_skeleton(lines.copy())
+                phase.update(points=len(skeleton_points), cells=len(skeleton))
             if not skeleton_points:
                 continue
-            skeleton = self.skeleton_to_2d_table(skeleton)
+            with telemetry.phase('skeleton_to_2d_table') as phase:
+                skeleton = self.skeleton_to_2d_table(skeleton)
+                phase['rows'] = len(skeleton)
 
             # for p in points:
             #     p.draw(canvas)
 
-            beaut_table = Table(cells, skeleton, ugly_table, page.extract_words())
-            beaut_table.build_table()
+            with telemetry.phase('build_table', cells=len(cells)):
+                beaut_table = Table(cells, skeleton, ugly_table, context.words)
+                beaut_table.build_table()
             if self.draw:
                 for cell in beaut_table.cells:
                     cell.draw(canvas)
@@ -808,6 +1088,8 @@ class TableExtractor:
                 im.save('page-{}-{}-skeleton.png'.format(page_n + 1, n))
             beaut_tables.append(beaut_table)
 
+        if owns_context:
+            context.close()
         return beaut_tables
 
 
@@ -869,7 +1151,7 @@ def extract_table_title(bbox, page, margin=25):
     
     Args:
         bbox: Tuple of (x0, y0, x1, y1) bounding box coordinates
-        page: pdfplumber page object
+        page: pdfplumber page object, or the PageContext of that page
         margin: Pixels to search above the table (default: 30)
     
     Returns:
@@ -892,9 +1174,11 @@ def extract_table_title(bbox, page, margin=25):
     )
     
     try:
-        cropped = page.within_bbox(search_bbox)
-        text = cropped.extract_text()
-        print(text)
+        if isinstance(page, PageContext):
+            text = page.text_within(search_bbox)
+        else:
+            cropped = page.within_bbox(search_bbox)
+            text = cropped.extract_text()
         
         if not text:
             return {
@@ -970,6 +1254,23 @@ def extract_table_title(bbox, page, margin=25):
         }
 
 
+CAPTION_PATTERN = re.compile(r'T\s*a\s*b\s*l\s*e\s*\d', re.IGNORECASE)
+
+
+def page_may_have_titled_table(page, min_edges=2):
+    """
+    Cheap check run before the table geometry.
+
+    A page can only produce a kept table if TableFinder has at least a couple
+    of horizontal and vertical ruling edges to build a grid from, and if a
+    "Table N" caption (as matched by extract_table_title) appears somewhere
+    in its text.
+    """
+    if len(page.horizontal_edges) < min_edges or len(page.vertical_edges) < min_edges:
+        return False
+    return bool(CAPTION_PATTERN.search(page.extract_text() or ''))
+
+
 def merge_tables(table1, table2):
     """
     Merge two tables by concatenating their rows (excluding header from second table).
@@ -994,21 +1295,127 @@ def merge_tables(table1, table2):
     return table1
 
 
-def extract_all_tables_auto(path, output_directory, start_page=0, end_page=None, debug=False, output_format='csv'):
+def table_bbox(table):
+    """Bounding box (x0, y0, x1, y1) of a parsed table"""
+    min_x = min(cell.p1.x for cell in table.cells)
+    min_y = min(cell.p1.y for cell in table.cells)
+    max_x = max(cell.p3.x for cell in table.cells)
+    max_y = max(cell.p3.y for cell in table.cells)
+    return min_x, min_y, max_x, max_y
+
+
+def extract_page_tables(pdf_interpreter, page_index, prescreen=True):
     """
-    Automatically extract all tables from a PDF by detecting table titles.
-    Only processes tables with "Table X." titles and handles continuations.
-    
-    Args:
-        path (str): Path to the PDF file
-        output_directory (str): Directory where CSV/Excel files will be saved
-        start_page (int): First page to process (0-indexed, default: 0)
-        end_page (int): Last page to process (0-indexed, default: None = all pages)
-        debug (bool): If True, print detailed processing information
-        output_format (str): Output format - 'csv', 'excel', or 'both' (default: 'csv')
-    
-    Returns:
-        dict: Summary of extracted tables with status for each page
+    Parse one page and read the title above each of its tables.
+
+    Only depends on the page itself, so pages can be processed in any order
+    or process. Returns a picklable dict:
+        'tables': list of {'table_index', 'table', 'title_info'} dicts
+                  (title_info is None for tables without cells)
+        'screened_out': True if page_may_have_titled_table ruled the page out
+        'screen_seconds': time spent in the pre-screen
+        'parse_seconds': time spent on table geometry and titles
+        'phases': time and counts per phase on this page (CollectingTelemetry.summary())
+    """
+    context = PageContext(pdf_interpreter.pdf.pages[page_index])
+    telemetry = PageTelemetry(get_telemetry())
+    # Loading the page objects is needed either way; keep it out of both timings
+    with telemetry.phase('load_page') as phase:
+        phase['chars'] = len(context.page.objects.get('char', []))
+    start = time.time()
+    if prescreen and not page_may_have_titled_table(context.page):
+        context.close()
+        screen_seconds = time.time() - start
+        telemetry.record('prescreen', screen_seconds, pages_skipped=1)
+        return {'tables': [], 'screened_out': True, 'screen_seconds': screen_seconds, 'parse_seconds': 0.0,
+                'phases': telemetry.summary()}
+    screen_seconds = time.time() - start
+    telemetry.record('prescreen', screen_seconds, pages_skipped=0)
+    descriptions = []
+    with use_telemetry(telemetry):
+        tables = pdf_interpreter.parse_page(page_index, context)
+    for table_idx, table in enumerate(tables):
+        with telemetry.phase('table_title'):
+            title_info = extract_table_title(table_bbox(table), context) if table.cells else None
+        # Page words are only needed while building the table
+        table.words = []
+        descriptions.append({'table_index': table_idx, 'table': table, 'title_info': title_info})
+    context.close()
+    return {'tables': descriptions, 'screened_out': False, 'screen_seconds': screen_seconds,
+            'parse_seconds': time.time() - start - screen_seconds, 'phases': telemetry.summary()}
+
+
+_worker_extractor = None
+
+
+def _init_worker(path):
+    """Open the PDF once per worker process"""
+    global _worker_extractor
+    _worker_extractor = TableExtractor(path)
+
+
+def _extract_page_in_worker(page_index, prescreen):
+    return extract_page_tables(_worker_extractor, page_index, prescreen)
+
+
+def iter_page_tables(path, pdf_interpreter, page_indices, workers=1, prescreen=True):
+    """
+    Yield (page_index, extract_page_tables(...)) in page order, parsing the
+    pages in a pool of `workers` processes (each with its own pdfplumber
+    handle) when workers > 1.
+
+    At most PAGES_IN_FLIGHT_PER_WORKER pages per worker are submitted ahead
+    of the one being yielded, so finished pages waiting for a slow earlier
+    page do not pile up in memory.
+    """
+    if workers <= 1 or len(page_indices) < 2:
+        for page_index in page_indices:
+            yield page_index, extract_page_tables(pdf_interpreter, page_index, prescreen)
+        return
+    # Spawned, not forked: this also runs inside the API server's threads
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_init_worker, initargs=(path,)) as executor:
+        pending = iter(page_indices)
+        in_flight = deque()
+        for page_index in islice(pending, workers * PAGES_IN_FLIGHT_PER_WORKER):
+            in_flight.append((page_index, executor.submit(_extract_page_in_worker, page_index, prescreen)))
+        while in_flight:
+            page_index, future = in_flight.popleft()
+            result = future.result()
+            for next_index in islice(pending, 1):
+                in_flight.append((next_index, executor.submit(_extract_page_in_worker, next_index, prescreen)))
+            yield page_index, result
+
+
+def _finish_table(open_table, output_format):
+    """Write the files of a table whose continuations are complete (each file is written once)"""
+    if output_format in ['csv', 'both']:
+        open_table['table_obj'].to_csv(open_table['csv_filename'])
+    if output_format in ['excel', 'both']:
+        open_table['table_obj'].to_excel(open_table['excel_filename'])
+    return open_table['entry']
+
+
+def iter_tables_auto(path, output_directory, start_page=0, end_page=None, debug=False, output_format='csv',
+                     workers=1, prescreen=True):
+    """
+    Streaming form of extract_all_tables_auto, for very large PDFs.
+
+    Yields (kind, entry) pairs as extraction progresses:
+        'start': the page range about to be processed ({'first_page', 'last_page', 'pages'})
+        'page': a page was processed and its files written ({'page', 'screened_out', 'screen_seconds',
+                'parse_seconds', 'write_seconds', 'phases'}); 'phases' is the per-phase time and counts
+                of the page, see extract_page_tables
+        'skipped' / 'merged': as in extract_all_tables_auto's results
+        'success': a table and all of its continuations have been written
+
+    A table's files are written once, when no continuation can follow
+    anymore (a new table starts or the last page is done), with the rows of
+    all its continuations. Only that one open table is kept between pages
+    and page objects are released as soon as a page is parsed, so memory
+    stays flat regardless of the page count.
+
+    Args: see extract_all_tables_auto
     """
     
     # Validate output format
@@ -1029,160 +1436,236 @@ def extract_all_tables_auto(path, output_directory, start_page=0, end_page=None,
     else:
         end_page = min(end_page, total_pages - 1)
     
-    # Track extraction results
-    results = {
-        "success": [],
-        "skipped": [],
-        "merged": [],
-        "errors": [],
-        "total_tables": 0,
-        "total_pages_processed": 0
-    }
+    files_per_table = 2 if output_format == 'both' else 1
     
-    # Store last table for continuation detection
-    last_table_info = None  # {table_obj, clean_title, filename, page}
+    # Table that continuations may still be merged into
+    open_table = None  # {table_obj, clean_title, csv_filename, excel_filename, page, entry}
     
     print(f"Processing pages {start_page} to {end_page} ({end_page - start_page + 1} pages)")
+    yield 'start', {"first_page": start_page + 1, "last_page": end_page + 1, "pages": end_page - start_page + 1}
     
-    # Process each page
-    for page_index in range(start_page, end_page + 1):
-        page_num = page_index + 1  # 1-indexed for display
-        
-        if debug:
-            print(f"\n{'='*60}")
-            print(f"Page {page_num} (index {page_index})")
-            print(f"{'='*60}")
-        
-    
-        page = pdf_interpreter.pdf.pages[page_index]
-        
-        # Extract all potential tables on this page
-        all_tables = pdf_interpreter.parse_page(page_index)
-        
-        if not all_tables:
-            if debug:
-                print(f"  No tables found")
-            results["total_pages_processed"] += 1
-            continue
-        
-        if debug:
-            print(f"  Found {len(all_tables)} potential table(s)")
-        
-        # Process each table
-        for table_idx, table in enumerate(all_tables):
-            # Get table bounding box
-            if not table.cells:
-                if debug:
-                    print(f"  Table {table_idx}: No cells, skipping")
-                continue
-            
-            min_x = min(cell.p1.x for cell in table.cells)
-            min_y = min(cell.p1.y for cell in table.cells)
-            max_x = max(cell.p3.x for cell in table.cells)
-            max_y = max(cell.p3.y for cell in table.cells)
-            bbox = (min_x, min_y, max_x, max_y)
-            
-            # Check for table title above the table
-            title_info = extract_table_title(bbox, page)
-            
-            if not title_info['has_title']:
-                if debug:
-                    print(f"  Table {table_idx}: No 'Table X.' title found, skipping")
-                results["skipped"].append({
-                    "page": page_num,
-                    "table_index": table_idx,
-                    "reason": "No table title found"
-                })
-                continue
+    telemetry = get_telemetry()
+    try:
+        # Titles and continuations are handled here, strictly in page order
+        for page_index, parsed_page in iter_page_tables(path, pdf_interpreter, range(start_page, end_page + 1),
+                                                       workers, prescreen):
+            page_num = page_index + 1  # 1-indexed for display
+            all_tables = parsed_page['tables']
+            # File writes triggered by this page, on top of the phases it was parsed with
+            page_telemetry = PageTelemetry(telemetry)
             
             if debug:
-                print(f"  Table {table_idx}: '{title_info['full_title']}'")
-                if title_info['is_continued']:
-                    print(f"    -> CONTINUATION")
+                print(f"\n{'='*60}")
+                print(f"Page {page_num} (index {page_index})")
+                print(f"{'='*60}")
+                if not all_tables:
+                    print(f"  Skipped by pre-screen" if parsed_page['screened_out'] else f"  No tables found")
+                else:
+                    print(f"  Found {len(all_tables)} potential table(s)")
             
-            # Handle continuation
-            if title_info['is_continued']:
-                if last_table_info and last_table_info['clean_title'] == title_info['clean_title']:
+            # Process each table
+            for description in all_tables:
+                table_idx = description['table_index']
+                table = description['table']
+                if not table.cells:
                     if debug:
-                        print(f"    -> Merging with table from page {last_table_info['page']}")
-                    
-                    # Merge tables
-                    last_table_info['table_obj'] = merge_tables(last_table_info['table_obj'], table)
-                    
-                    # Re-save the merged table in the appropriate format(s)
-                    if output_format in ['csv', 'both']:
-                        csv_path = Path(last_table_info['csv_filename'])
-                        last_table_info['table_obj'].to_csv(str(csv_path))
-                    
-                    if output_format in ['excel', 'both']:
-                        excel_path = Path(last_table_info['excel_filename'])
-                        last_table_info['table_obj'].to_excel(str(excel_path))
-                    
-                    # Track the merge
-                    results["merged"].append({
-                        "main_page": last_table_info['page'],
-                        "continued_on": page_num,
-                        "title": title_info['clean_title']
-                    })
-                    
-                    if debug:
-                        print(f"    -> Merged and saved")
-                else:
+                        print(f"  Table {table_idx}: No cells, skipping")
+                    continue
+                
+                # Title found above the table while the page was parsed
+                title_info = description['title_info']
+                
+                if not title_info['has_title']:
                     if debug:
-                        print(f"    -> WARNING: Continuation but no matching previous table")
-                    results["skipped"].append({
+                        print(f"  Table {table_idx}: No 'Table X.' title found, skipping")
+                    yield 'skipped', {
                         "page": page_num,
                         "table_index": table_idx,
-                        "reason": "Continuation with no matching previous table"
-                    })
-                continue
-            
-            # New table - save it
-            sanitized_title = sanitize_filename(title_info['clean_title'])
-            
-            # Generate filenames based on output format
-            csv_filename = f"{sanitized_title}.csv"
-            excel_filename = f"{sanitized_title}.xlsx"
-            
-            csv_path = output_dir / csv_filename
-            excel_path = output_dir / excel_filename
-            
-            # Save table in the requested format(s)
-            saved_files = []
-            
-            if output_format in ['csv', 'both']:
-                table.to_csv(str(csv_path))
-                saved_files.append(csv_filename)
-                if debug:
-                    print(f"    -> Saved CSV: {csv_filename}")
-            
-            if output_format in ['excel', 'both']:
-                table.to_excel(str(excel_path))
-                saved_files.append(excel_filename)
+                        "reason": "No table title found"
+                    }
+                    continue
+                
                 if debug:
-                    print(f"    -> Saved Excel: {excel_filename}")
+                    print(f"  Table {table_idx}: '{title_info['full_title']}'")
+                    if title_info['is_continued']:
+                        print(f"    -> CONTINUATION")
+                
+                # Handle continuation
+                if title_info['is_continued']:
+                    if open_table and open_table['clean_title'] == title_info['clean_title']:
+                        if debug:
+                            print(f"    -> Merging with table from page {open_table['page']}")
+                        
+                        # Files are written once the table is finished
+                        open_table['table_obj'] = merge_tables(open_table['table_obj'], table)
+                        
+                        if debug:
+                            print(f"    -> Merged")
+                        yield 'merged', {
+                            "main_page": open_table['page'],
+                            "continued_on": page_num,
+                            "title": title_info['clean_title']
+                        }
+                    else:
+                        if debug:
+                            print(f"    -> WARNING: Continuation but no matching previous table")
+                        yield 'skipped', {
+                            "page": page_num,
+                            "table_index": table_idx,
+                            "reason": "Continuation with no matching previous table"
+                        }
+                    continue
+                
+                # New table - the previous one cannot be continued anymore
+                if open_table:
+                    with page_telemetry.phase('write_files', files=files_per_table):
+                        finished = _finish_table(open_table, output_format)
+                    yield 'success', finished
+                    open_table = None
+                
+                sanitized_title = sanitize_filename(title_info['clean_title'])
+                
+                # Generate filenames based on output format
+                csv_filename = f"{sanitized_title}.csv"
+                excel_filename = f"{sanitized_title}.xlsx"
+                
+                csv_path = output_dir / csv_filename
+                excel_path = output_dir / excel_filename
+                
+                # Files the table will be saved to, in the requested format(s)
+                saved_files = []
+                
+                if output_format in ['csv', 'both']:
+                    saved_files.append(csv_filename)
+                
+                if output_format in ['excel', 'both']:
+                    saved_files.append(excel_filename)
+                
+                # Keep open for potential continuation
+                open_table = {
+                    'table_obj': table,
+                    'clean_title': title_info['clean_title'],
+                    'csv_filename': str(csv_path),
+                    'excel_filename': str(excel_path),
+                    'page': page_num,
+                    'entry': {
+                        "page": page_num,
+                        "table_number": title_info['table_number'],
+                        "title": title_info['clean_title'],
+                        "files": saved_files,
+                        "csv_path": str(csv_path) if output_format in ['csv', 'both'] else None,
+                        "excel_path": str(excel_path) if output_format in ['excel', 'both'] else None
+                    }
+                }
             
-            # Store for potential continuation
-            last_table_info = {
-                'table_obj': table,
-                'clean_title': title_info['clean_title'],
-                'csv_filename': str(csv_path),
-                'excel_filename': str(excel_path),
-                'page': page_num
-            }
+            # No continuation can follow the last page
+            if open_table and page_index == end_page:
+                with page_telemetry.phase('write_files', files=files_per_table):
+                    finished = _finish_table(open_table, output_format)
+                yield 'success', finished
+                open_table = None
             
-            # Track success
-            results["success"].append({
+            write_phases = page_telemetry.summary()
+            yield 'page', {
                 "page": page_num,
-                "table_number": title_info['table_number'],
-                "title": title_info['clean_title'],
-                "files": saved_files,
-                "csv_path": str(csv_path) if output_format in ['csv', 'both'] else None,
-                "excel_path": str(excel_path) if output_format in ['excel', 'both'] else None
-            })
-            
+                "screened_out": parsed_page['screened_out'],
+                "screen_seconds": parsed_page['screen_seconds'],
+                "parse_seconds": parsed_page['parse_seconds'],
+                "write_seconds": write_phases.get('write_files', {}).get('seconds', 0.0),
+                "phases": {**parsed_page['phases'], **write_phases}
+            }
+    finally:
+        pdf_interpreter.pdf.close()
+
+
+def add_page_timing(timing, page_entry):
+    """Add a 'page' entry of iter_tables_auto to the per-page list and the per-phase totals of `timing`"""
+    timing["pages"].append({
+        "page": page_entry['page'],
+        "screened_out": page_entry['screened_out'],
+        "seconds": round(page_entry['screen_seconds'] + page_entry['parse_seconds'] + page_entry['write_seconds'], 4),
+        "phases": page_entry['phases']
+    })
+    for phase, stats in page_entry['phases'].items():
+        totals = timing["phases"].setdefault(phase, {})
+        for name, value in stats.items():
+            totals[name] = round(totals.get(name, 0) + value, 4)
+
+
+def extract_all_tables_auto(path, output_directory, start_page=0, end_page=None, debug=False, output_format='csv',
+                            workers=1, prescreen=True, progress=None):
+    """
+    Automatically extract all tables from a PDF by detecting table titles.
+    Only processes tables with "Table X." titles and handles continuations.
+    
+    Args:
+        path (str): Path to the PDF file
+        output_directory (str): Directory where CSV/Excel files will be saved
+        start_page (int): First page to process (0-indexed, default: 0)
+        end_page (int): Last page to process (0-indexed, default: None = all pages)
+        debug (bool): If True, print detailed processing information
+        output_format (str): Output format - 'csv', 'excel', or 'both' (default: 'csv')
+        workers (int): Number of processes parsing pages in parallel (default: 1 = in this process).
+            Continuations are still merged in page order.
+        prescreen (bool): Skip the table geometry on pages without ruling lines or a
+            "Table N" caption, which cannot produce a kept table (default: True)
+        progress (callable): Called with every (kind, entry) pair of iter_tables_auto
+            as extraction advances (default: None)
+    
+    Returns:
+        dict: Summary of extracted tables with status for each page; 'timing' holds the
+            time and counts (lines, points, cells, files) per phase, in total and per page
+    """
+    
+    # Track extraction results
+    results = {
+        "success": [],
+        "skipped": [],
+        "merged": [],
+        "errors": [],
+        "total_tables": 0,
+        "total_pages_processed": 0,
+        "prescreen": {
+            "pages_skipped": 0,
+            "screening_seconds": 0.0,
+            "estimated_seconds_saved": 0.0
+        },
+        "timing": {
+            "phases": {},
+            "pages": []
+        }
+    }
+    parsed_seconds = []
+    
+    for kind, entry in iter_tables_auto(path, output_directory, start_page=start_page, end_page=end_page,
+                                        debug=debug, output_format=output_format, workers=workers,
+                                        prescreen=prescreen):
+        if progress is not None:
+            progress(kind, entry)
+        if kind == 'start':
+            continue
+        if kind == 'page':
+            results["total_pages_processed"] += 1
+            results["prescreen"]["screening_seconds"] += entry['screen_seconds']
+            if entry['screened_out']:
+                results["prescreen"]["pages_skipped"] += 1
+            else:
+                parsed_seconds.append(entry['parse_seconds'])
+            add_page_timing(results["timing"], entry)
+            continue
+        results[kind].append(entry)
+        if kind == 'success':
             results["total_tables"] += 1
-        
-        results["total_pages_processed"] += 1
+    
+    # A screened-out page would have cost about as much table geometry as the average parsed page
+    prescreen_stats = results["prescreen"]
+    if prescreen_stats["pages_skipped"] and parsed_seconds:
+        average_page_seconds = sum(parsed_seconds) / len(parsed_seconds)
+        prescreen_stats["estimated_seconds_saved"] = round(
+            prescreen_stats["pages_skipped"] * average_page_seconds - prescreen_stats["screening_seconds"], 2)
+    prescreen_stats["screening_seconds"] = round(prescreen_stats["screening_seconds"], 2)
+    if prescreen_stats["pages_skipped"]:
+        print(f"Pre-screen skipped {prescreen_stats['pages_skipped']} page(s), "
+              f"saving about {prescreen_stats['estimated_seconds_saved']}s")
     
     return results
\ No newline at end of file
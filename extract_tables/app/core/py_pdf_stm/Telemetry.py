@@ -0,0 +1,104 @@
+"""
+Progress / telemetry hook for the table extraction pipeline.
+
+The pipeline reports each phase it runs (with its duration and a few
+counts) to the telemetry of the current context. The default telemetry
+does nothing, so there is no console output or bookkeeping unless a
+caller opts in:
+
+    with use_telemetry(CollectingTelemetry()) as telemetry:
+        extract_all_tables_auto(...)
+    print(telemetry.summary())
+
+The current telemetry is kept in a context variable, so concurrent
+requests in the API server each see their own. Pages parsed in worker
+processes (workers > 1) are not reported to it; their per-page breakdown
+(PageTelemetry) comes back with the page results either way.
+"""
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict
+
+
+class Telemetry:
+    """No-op telemetry; subclass and override record() to collect something"""
+
+    def record(self, phase: str, seconds: float, **counts):
+        """Called once per finished phase with its duration and counts"""
+        pass
+
+    @contextmanager
+    def phase(self, name: str, **counts):
+        """
+        Time a block as one phase. The yielded dict can be filled with
+        counts while the block runs:
+
+            with get_telemetry().phase('filter_lines', lines_in=len(lines)) as phase:
+                lines = filter_lines(lines)
+                phase['lines_out'] = len(lines)
+        """
+        start = time.perf_counter()
+        try:
+            yield counts
+        finally:
+            self.record(name, time.perf_counter() - start, **counts)
+
+
+class LoggingTelemetry(Telemetry):
+    """Logs every phase, e.g. to feed log-based metrics"""
+
+    def __init__(self, logger: logging.Logger = None, level=logging.DEBUG):
+        self.logger = logger or logging.getLogger('table_extractor')
+        self.level = level
+
+    def record(self, phase: str, seconds: float, **counts):
+        self.logger.log(self.level, '%s %.4fs %s', phase, seconds, counts)
+
+
+class CollectingTelemetry(Telemetry):
+    """Aggregates calls, time and counts per phase"""
+
+    def __init__(self):
+        self.phases = {}  # type: Dict[str, Dict[str, Any]]
+
+    def record(self, phase: str, seconds: float, **counts):
+        stats = self.phases.setdefault(phase, {'calls': 0, 'seconds': 0.0, 'counts': {}})
+        stats['calls'] += 1
+        stats['seconds'] += seconds
+        for name, value in counts.items():
+            stats['counts'][name] = stats['counts'].get(name, 0) + value
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        return {phase: {'calls': stats['calls'], 'seconds': round(stats['seconds'], 4), **stats['counts']}
+                for phase, stats in self.phases.items()}
+
+
+class PageTelemetry(CollectingTelemetry):
+    """Collects the phases of a single page and passes every record on to `parent`"""
+
+    def __init__(self, parent: Telemetry):
+        super().__init__()
+        self.parent = parent
+
+    def record(self, phase: str, seconds: float, **counts):
+        super().record(phase, seconds, **counts)
+        self.parent.record(phase, seconds, **counts)
+
+
+_current = ContextVar('table_extractor_telemetry', default=Telemetry())
+
+
+def get_telemetry() -> Telemetry:
+    return _current.get()
+
+
+@contextmanager
+def use_telemetry(telemetry: Telemetry):
+    """Report to `telemetry` for the duration of the block"""
+    token = _current.set(telemetry)
+    try:
+        yield telemetry
+    finally:
+        _current.reset(token)
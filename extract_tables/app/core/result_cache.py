@@ -0,0 +1,144 @@
+# app/core/result_cache.py
+"""
+Content-addressed cache of extraction results.
+
+The same vendor datasheets get uploaded over and over. Results are stored
+under a key made of the SHA-256 of the PDF bytes, the extractor version,
+the output format and the page range; a repeat upload gets the stored
+files hard-linked (or copied) into its job directory instead of running
+the extraction again. Entries are evicted least-recently-used first when
+the cache grows past its size limit. Timings are not stored: they belong
+to the run that filled the cache, not to the jobs served from it.
+"""
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from app.core.py_pdf_stm.TableExtractor import EXTRACTOR_VERSION
+
+RESULTS_FILE = "results.json"
+INDEX_FILE = "index.json"
+
+
+def link_or_copy(source: Path, destination: Path):
+    """Hard-link a file, or copy it if linking is not possible (other device, unsupported fs)"""
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copy2(source, destination)
+
+
+def relocate_results(results: Dict[str, Any], output_dir: Path) -> Dict[str, Any]:
+    """Point the file paths of an extract_all_tables_auto result at output_dir"""
+    results = json.loads(json.dumps(results))
+    for entry in results.get('success', []):
+        for key in ('csv_path', 'excel_path'):
+            if entry.get(key):
+                entry[key] = str(output_dir / Path(entry[key]).name)
+    return results
+
+
+class ResultCache:
+    """
+    Extraction results on disk, keyed by make_key().
+
+    Args:
+        root: Cache directory (one sub-directory per entry plus index.json)
+        max_bytes: Total size above which least recently used entries are evicted
+    """
+
+    def __init__(self, root: Path, max_bytes: int):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.index = {}  # type: Dict[str, Dict[str, Any]]
+        index_path = self.root / INDEX_FILE
+        if index_path.exists():
+            with open(index_path, 'r', encoding='utf-8') as f:
+                self.index = json.load(f)
+
+    @staticmethod
+    def make_key(file_hash: str, output_format: str, start_page: int = 0, end_page: Optional[int] = None,
+                 version: str = EXTRACTOR_VERSION) -> str:
+        raw = f"{file_hash}|{version}|{output_format}|{start_page}|{end_page}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _save_index(self):
+        tmp_path = self.root / f"{INDEX_FILE}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f)
+        os.replace(tmp_path, self.root / INDEX_FILE)
+
+    def lookup(self, key: str, output_dir: Path) -> Optional[Dict[str, Any]]:
+        """
+        On a hit, place the cached files in output_dir and return the cached
+        results with their paths pointing there; None on a miss.
+        """
+        with self._lock:
+            entry_dir = self.root / key
+            if key not in self.index or not (entry_dir / RESULTS_FILE).exists():
+                self.misses += 1
+                return None
+            output_dir.mkdir(parents=True, exist_ok=True)
+            for cached_file in entry_dir.iterdir():
+                if cached_file.name != RESULTS_FILE:
+                    link_or_copy(cached_file, output_dir / cached_file.name)
+            with open(entry_dir / RESULTS_FILE, 'r', encoding='utf-8') as f:
+                results = json.load(f)
+            results.pop('timing', None)  # entries written before timings were left out
+            self.index[key]['last_used'] = time.time()
+            self.index[key]['hits'] = self.index[key].get('hits', 0) + 1
+            self._save_index()
+            self.hits += 1
+        return relocate_results(results, output_dir)
+
+    def store(self, key: str, output_dir: Path, results: Dict[str, Any]):
+        """Add the files of a finished extraction in output_dir, then evict down to max_bytes"""
+        with self._lock:
+            entry_dir = self.root / key
+            tmp_dir = self.root / f"{key}.tmp"
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            tmp_dir.mkdir(parents=True)
+            size = 0
+            for output_file in output_dir.iterdir():
+                if output_file.is_file():
+                    link_or_copy(output_file, tmp_dir / output_file.name)
+                    size += output_file.stat().st_size
+            with open(tmp_dir / RESULTS_FILE, 'w', encoding='utf-8') as f:
+                json.dump({key: value for key, value in results.items() if key != 'timing'}, f)
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            os.replace(tmp_dir, entry_dir)
+            now = time.time()
+            self.index[key] = {'size': size, 'created': now, 'last_used': now, 'hits': 0}
+            self._evict()
+            self._save_index()
+
+    def _evict(self):
+        total = sum(entry['size'] for entry in self.index.values())
+        for key in sorted(self.index, key=lambda k: self.index[k]['last_used']):
+            if total <= self.max_bytes:
+                break
+            total -= self.index.pop(key)['size']
+            shutil.rmtree(self.root / key, ignore_errors=True)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = sum(entry['size'] for entry in self.index.values())
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self.index),
+                'total_bytes': total,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'extractor_version': EXTRACTOR_VERSION
+            }
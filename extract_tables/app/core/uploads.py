@@ -0,0 +1,127 @@
+# app/core/uploads.py
+"""
+Upload size limits and chunked saving of uploaded files.
+
+Starlette parses a multipart body completely (spooling each file to a
+temporary file) before the endpoint runs, so a check inside the endpoint
+only happens once the whole upload has arrived. Oversized requests are
+therefore stopped by UploadSizeLimit, an ASGI middleware that looks at
+Content-Length before anything is read and counts the body bytes as they
+are received. save_upload then copies the spooled file to its destination
+in fixed-size chunks, with a per-file size check and an on-the-fly digest.
+"""
+import hashlib
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+from starlette.responses import JSONResponse
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1 MB
+MULTIPART_OVERHEAD = 1024 * 1024  # allowance for part headers and form fields on top of the file data
+
+
+class UploadTooLarge(Exception):
+    def __init__(self, max_size: int, what: str = "File"):
+        super().__init__(f"{what} too large. Maximum size is {max_size / (1024 * 1024)} MB")
+        self.max_size = max_size
+
+
+class UploadSizeLimit:
+    """
+    ASGI middleware limiting the request body size of upload endpoints.
+
+    `limits` maps request paths to the largest file data they accept
+    (MULTIPART_OVERHEAD is added for the multipart framing). A declared
+    Content-Length over the limit is answered with 413 before the body is
+    read; a body without one (chunked) is cut off as soon as it crosses the
+    limit.
+    """
+
+    def __init__(self, app, limits: Dict[str, int], overhead: int = MULTIPART_OVERHEAD):
+        self.app = app
+        self.limits = limits
+        self.overhead = overhead
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['path'] not in self.limits:
+            await self.app(scope, receive, send)
+            return
+        max_size = self.limits[scope['path']]
+        limit = max_size + self.overhead
+        too_large = JSONResponse({'detail': str(UploadTooLarge(max_size, "Upload"))}, status_code=413)
+
+        declared = dict(scope['headers']).get(b'content-length')
+        if declared is not None and declared.isdigit() and int(declared) > limit:
+            await too_large(scope, receive, send)
+            return
+
+        received = 0
+        response_started = False
+        rejected = False
+
+        async def limited_receive():
+            nonlocal received, rejected
+            message = await receive()
+            if message['type'] == 'http.request':
+                received += len(message.get('body', b''))
+                if received > limit:
+                    # Answer now: the form parser turns any error of the stream into a 400
+                    if not response_started and not rejected:
+                        rejected = True
+                        await too_large(scope, receive, send)
+                    raise UploadTooLarge(max_size, "Upload")
+            return message
+
+        async def tracking_send(message):
+            nonlocal response_started
+            if rejected:
+                return  # the app's own error response, after the 413 went out
+            if message['type'] == 'http.response.start':
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except UploadTooLarge:
+            if not rejected:
+                raise
+
+
+async def save_upload(upload, destination: Path, max_size: int, hash_name: Optional[str] = None,
+                      chunk_size: int = UPLOAD_CHUNK_SIZE) -> dict:
+    """
+    Copy a starlette/FastAPI UploadFile to `destination`.
+
+    The upload has already been received (UploadSizeLimit bounds the whole
+    request); this enforces max_size per file. The file is written to a
+    .part file next to the destination and renamed when complete; on any
+    error (including UploadTooLarge) nothing is left behind. If `hash_name`
+    is given (e.g. 'sha256'), the digest is computed on the fly.
+
+    Returns:
+        dict: {'size': int, 'hash': hex digest or None}
+    """
+    if getattr(upload, 'size', None) and upload.size > max_size:
+        raise UploadTooLarge(max_size)
+
+    digest = hashlib.new(hash_name) if hash_name else None
+    partial_path = destination.with_name(destination.name + '.part')
+    size = 0
+    try:
+        with open(partial_path, 'wb') as f:
+            while True:
+                chunk = await upload.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_size:
+                    raise UploadTooLarge(max_size)
+                if digest is not None:
+                    digest.update(chunk)
+                f.write(chunk)
+        os.replace(partial_path, destination)
+    finally:
+        if partial_path.exists():
+            partial_path.unlink()
+    return {'size': size, 'hash': digest.hexdigest() if digest is not None else None}
@@ -0,0 +1,71 @@
+# app/core/zip_stream.py
+"""
+ZIP archives generated on the fly.
+
+The archive is produced entry by entry while the response is being sent:
+zipfile writes into a small buffer that is drained after every chunk, so
+memory stays at about one chunk and the first bytes go out immediately.
+"""
+import zipfile
+from pathlib import Path
+from typing import Iterable, Iterator, Tuple
+
+ZIP_CHUNK_SIZE = 256 * 1024
+
+# Formats that are zip containers already; deflating them again costs CPU for no gain
+COMPRESSED_SUFFIXES = ('.xlsx',)
+
+
+class _ChunkBuffer:
+    """Write-only, non-seekable sink for zipfile (makes it use data descriptors)"""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b''.join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def iter_zip(files: Iterable[Tuple[Path, str]], store_compressed: bool = True,
+             chunk_size: int = ZIP_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Yield a ZIP archive of (path, arcname) pairs as a stream of bytes.
+
+    Args:
+        files: Files to add, in order
+        store_compressed: Store COMPRESSED_SUFFIXES files as-is instead of deflating them
+        chunk_size: Read size per file chunk
+    """
+    buffer = _ChunkBuffer()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for path, arcname in files:
+            zinfo = zipfile.ZipInfo.from_file(path, arcname)
+            if store_compressed and path.suffix.lower() in COMPRESSED_SUFFIXES:
+                zinfo.compress_type = zipfile.ZIP_STORED
+            else:
+                zinfo.compress_type = zipfile.ZIP_DEFLATED
+            with open(path, 'rb') as src, zf.open(zinfo, 'w', force_zip64=zinfo.file_size > zipfile.ZIP64_LIMIT) as dst:
+                while True:
+                    chunk = src.read(chunk_size)
+                    if not chunk:
+                        break
+                    dst.write(chunk)
+                    data = buffer.drain()
+                    if data:
+                        yield data
+            data = buffer.drain()
+            if data:
+                yield data
+    # Central directory, written when the archive is closed
+    data = buffer.drain()
+    if data:
+        yield data
@@ -4,7 +4,8 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 # Import the PDF extractor router
-from app.api.pdf_extractor import router as pdf_extractor_router
+from app.api.pdf_extractor import UPLOAD_LIMITS, router as pdf_extractor_router
+from app.core.uploads import UploadSizeLimit
 
 app = FastAPI(
     title="Your API",
@@ -12,6 +13,9 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# Reject oversized uploads before their body is read (added first so CORS headers still wrap the 413)
+app.add_middleware(UploadSizeLimit, limits=UPLOAD_LIMITS)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -0,0 +1,179 @@
+"""
+End-to-end benchmark of extract_all_tables_auto over generated PDFs.
+
+Each scenario generates a PDF of ruled tables with known content (see
+synthetic_pdf.py): different sizes, densities, spanning cells and tables
+continued over several pages. The extraction is timed (best of --repeat,
+with the per-phase breakdown of the best run) and its CSV output is
+checked cell by cell against the generated content. Results are written
+as JSON (by default to benchmarks/results/, which git ignores) so runs can
+be compared:
+
+Usage (from extract_tables/):
+    python -m benchmarks.bench_extraction
+    python -m benchmarks.bench_extraction --scenario dense --scenario continued --repeat 5
+    python -m benchmarks.bench_extraction --output after.json --compare before.json
+    python -m benchmarks.bench_extraction --output -   # JSON to stdout only
+
+Exits with status 1 if any extracted table differs from what was generated.
+"""
+import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.py_pdf_stm.TableExtractor import EXTRACTOR_VERSION, extract_all_tables_auto
+from benchmarks.synthetic_pdf import generate, make_table
+
+RESULTS_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+# name: (number of tables, make_table options, generate options)
+SCENARIOS = {
+    'small': (24, {'rows': 6, 'cols': 4}, {}),
+    'dense': (12, {'rows': 45, 'cols': 8}, {'row_height': 9.0}),
+    'sparse': (12, {'rows': 30, 'cols': 6, 'fill': 0.3}, {}),
+    'wide': (10, {'rows': 20, 'cols': 9}, {'cell_width': 55.0}),
+    'spans': (12, {'rows': 20, 'cols': 6, 'col_spans': 4, 'row_spans': 3}, {}),
+    'continued': (6, {'rows': 150, 'cols': 5, 'col_spans': 2, 'row_spans': 2}, {}),
+}
+
+
+def build_scenario(name, directory, scale=1.0, seed=0):
+    """Generate the PDF of a scenario; returns its path and the expected rows per table title"""
+    count, table_options, layout = SCENARIOS[name]
+    rng = random.Random(f"{name}-{seed}")
+    tables = [make_table(number, rng=rng, **table_options) for number in range(1, max(1, round(count * scale)) + 1)]
+    path = os.path.join(directory, f"{name}.pdf")
+    return path, generate(path, tables, **layout)
+
+
+def check_output(results, expected):
+    """Compare the CSV files of a run with the generated content"""
+    extracted = {}
+    for entry in results['success']:
+        with open(entry['csv_path'], newline='', encoding='utf-8') as f:
+            extracted[entry['title']] = list(csv.reader(f))
+    mismatches = []
+    cells_wrong = 0
+    for title, rows in expected.items():
+        found = extracted.get(title)
+        if found is None:
+            mismatches.append({'title': title, 'problem': 'missing'})
+            continue
+        wrong = sum(1 for row_a, row_b in zip(rows, found) for a, b in zip(row_a, row_b) if a != b)
+        wrong += sum(abs(len(row_a) - len(row_b)) for row_a, row_b in zip(rows, found))
+        if wrong or len(rows) != len(found):
+            cells_wrong += wrong
+            mismatches.append({'title': title, 'problem': 'content', 'cells_wrong': wrong,
+                               'rows_expected': len(rows), 'rows_extracted': len(found)})
+    for title in extracted.keys() - expected.keys():
+        mismatches.append({'title': title, 'problem': 'unexpected'})
+    return {
+        'tables_expected': len(expected),
+        'tables_extracted': len(extracted),
+        'tables_correct': len(expected) - sum(1 for m in mismatches if m['problem'] != 'unexpected'),
+        'cells_expected': sum(len(row) for rows in expected.values() for row in rows),
+        'cells_wrong': cells_wrong,
+        'correct': not mismatches,
+        'mismatches': mismatches[:10]
+    }
+
+
+def run_scenario(name, directory, repeat, workers, output_format, scale, seed):
+    path, expected = build_scenario(name, directory, scale, seed)
+    output_dir = os.path.join(directory, f"{name}_out")
+    best_seconds, best_results = None, None
+    for _ in range(repeat):
+        shutil.rmtree(output_dir, ignore_errors=True)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = extract_all_tables_auto(path, output_dir, output_format=output_format, workers=workers)
+        seconds = time.perf_counter() - start
+        if best_seconds is None or seconds < best_seconds:
+            best_seconds, best_results = seconds, results
+    pages = best_results['total_pages_processed']
+    return {
+        'pages': pages,
+        'tables': best_results['total_tables'],
+        'continuations_merged': len(best_results['merged']),
+        'seconds': round(best_seconds, 4),
+        'pages_per_second': round(pages / best_seconds, 2),
+        'phases': best_results['timing']['phases'],
+        'correctness': check_output(best_results, expected)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark extract_all_tables_auto on generated PDFs")
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                        help="Scenario to run (repeatable; default: all)")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--format', dest='output_format', choices=['csv', 'both'], default='csv',
+                        help="Also write Excel files with 'both'; correctness is checked on the CSV files")
+    parser.add_argument('--scale', type=float, default=1.0, help="Multiply the number of tables per scenario")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="JSON results file, '-' for stdout "
+                                         "(default: benchmarks/results/extraction_<time>.json)")
+    parser.add_argument('--compare', help="JSON results of an earlier run to compare timings with")
+    args = parser.parse_args()
+
+    created = datetime.now(timezone.utc)
+    report = {
+        'created': created.isoformat(timespec='seconds'),
+        'extractor_version': EXTRACTOR_VERSION,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': args.repeat,
+        'workers': args.workers,
+        'output_format': args.output_format,
+        'scale': args.scale,
+        'seed': args.seed,
+        'scenarios': {}
+    }
+    baseline = {}
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)['scenarios']
+
+    with tempfile.TemporaryDirectory(prefix='bench_extraction_') as directory:
+        for name in args.scenario or list(SCENARIOS):
+            result = run_scenario(name, directory, args.repeat, args.workers, args.output_format,
+                                  args.scale, args.seed)
+            report['scenarios'][name] = result
+            correctness = result['correctness']
+            line = (f"{name:10} {result['pages']:4} pages {result['tables']:4} tables "
+                    f"{result['seconds'] * 1000:9.1f} ms {result['pages_per_second']:7.2f} pages/s  "
+                    f"{'ok' if correctness['correct'] else 'WRONG'} "
+                    f"({correctness['tables_correct']}/{correctness['tables_expected']} tables)")
+            if name in baseline:
+                result['speedup'] = round(baseline[name]['seconds'] / result['seconds'], 3)
+                line += f"  {result['speedup']:.2f}x vs baseline"
+            print(line, file=sys.stderr if args.output == '-' else sys.stdout)
+
+    if args.output == '-':
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        output = args.output or os.path.join(RESULTS_FOLDER, f"extraction_{created:%Y%m%d_%H%M%S}.json")
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {output}")
+    if not all(result['correctness']['correct'] for result in report['scenarios'].values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Micro-benchmark for the skeleton cell-building neighbour lookups.
+
+Compares the list-scanning Point.get_right / Point.get_bottom against the
+PointGrid row/column index on a synthetic ruled grid, and checks that both
+return the same neighbours.
+
+Usage (from extract_tables/):
+    python -m benchmarks.bench_skeleton
+    python -m benchmarks.bench_skeleton --cols 60 --rows 40 --repeat 3
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.py_pdf_stm.TableExtractor import Point, PointGrid
+
+
+def make_grid(cols, rows, cell_width=12, cell_height=10):
+    """Fully connected intersection points of a cols x rows table"""
+    points = []
+    for row in range(rows + 1):
+        for col in range(cols + 1):
+            point = Point(col * cell_width, row * cell_height)
+            point.set_all_directions()
+            points.append(point)
+    return points
+
+
+def neighbours_by_scan(points):
+    return [(p.get_right(points), p.get_bottom(points, left=True), p.get_bottom(points, right=True))
+            for p in points]
+
+
+def neighbours_by_grid(points):
+    grid = PointGrid(points)
+    return [(grid.get_right(p), grid.get_bottom(p, left=True), grid.get_bottom(p, right=True))
+            for p in points]
+
+
+def best_of(func, points, repeat):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(points)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark skeleton neighbour lookups")
+    parser.add_argument('--cols', type=int, default=60)
+    parser.add_argument('--rows', type=int, default=40)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    points = make_grid(args.cols, args.rows)
+    scan_time, scan_result = best_of(neighbours_by_scan, points, args.repeat)
+    grid_time, grid_result = best_of(neighbours_by_grid, points, args.repeat)
+
+    identical = all(a is b for scan, grid in zip(scan_result, grid_result) for a, b in zip(scan, grid))
+    print(f"{args.cols}x{args.rows} grid, {len(points)} points, best of {args.repeat}")
+    print(f"  list scan : {scan_time * 1000:10.1f} ms")
+    print(f"  PointGrid : {grid_time * 1000:10.1f} ms  (index build included)")
+    print(f"  speedup   : {scan_time / grid_time:10.1f}x")
+    print(f"  identical : {identical}")
+    if not identical:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
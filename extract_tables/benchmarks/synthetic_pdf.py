@@ -0,0 +1,195 @@
+"""
+Synthetic datasheet PDFs with known table content, for benchmarks.
+
+Tables are drawn as ruled grids with a "Table N. <name>" caption above
+them. Tables that do not fit on the rest of a page are split, and the
+remaining rows go on the next page under a "Table N. <name> (continued)"
+caption with the header row repeated, as in real datasheets. Cells can
+span several columns (and rows) by leaving out the rulings between them.
+
+The PDF is written directly (one Helvetica font, lines and text), so no
+PDF library is needed. `generate()` returns the expected rows of every
+table as they should come out of extract_all_tables_auto.
+"""
+import random
+from typing import Dict, List
+
+PAGE_WIDTH = 595  # A4, in points
+PAGE_HEIGHT = 842
+MARGIN = 40
+CAPTION_GAP = 10  # caption baseline above the table's top ruling; must stay within the title search margin
+TABLE_GAP = 40
+MAX_TABLES_PER_PAGE = 4  # parse_page gives up on pages with more than 5 tables
+FONT_SIZE = 6
+
+
+def _escape(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+class PdfWriter:
+    """Minimal PDF writer: pages of straight lines and Helvetica text, in top-down coordinates"""
+
+    def __init__(self, width=PAGE_WIDTH, height=PAGE_HEIGHT):
+        self.width = width
+        self.height = height
+        self.pages = []  # type: List[List[str]]
+
+    def new_page(self):
+        self.pages.append(['0.5 w'])
+
+    def line(self, x1, top1, x2, top2):
+        self.pages[-1].append(f'{x1:.2f} {self.height - top1:.2f} m {x2:.2f} {self.height - top2:.2f} l S')
+
+    def text(self, x, baseline, text, size=FONT_SIZE):
+        self.pages[-1].append(f'BT /F1 {size} Tf {x:.2f} {self.height - baseline:.2f} Td ({_escape(text)}) Tj ET')
+
+    def save(self, path):
+        objects = [
+            b'<< /Type /Catalog /Pages 2 0 R >>',
+            None,  # page tree, once the page objects are numbered
+            b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>',
+        ]
+        page_ids = []
+        for commands in self.pages:
+            content = '\n'.join(commands).encode('latin-1')
+            objects.append(b'<< /Length %d >>\nstream\n%s\nendstream' % (len(content), content))
+            page_ids.append(len(objects) + 1)
+            objects.append(b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] /Contents %d 0 R '
+                           b'/Resources << /Font << /F1 3 0 R >> >> >>' % (self.width, self.height, len(objects)))
+        kids = ' '.join(f'{page_id} 0 R' for page_id in page_ids).encode('ascii')
+        objects[1] = b'<< /Type /Pages /Kids [%s] /Count %d >>' % (kids, len(page_ids))
+
+        out = bytearray(b'%PDF-1.4\n')
+        offsets = []
+        for number, body in enumerate(objects, start=1):
+            offsets.append(len(out))
+            out += b'%d 0 obj\n%s\nendobj\n' % (number, body)
+        xref = len(out)
+        out += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+        for offset in offsets:
+            out += b'%010d 00000 n \n' % offset
+        out += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+        with open(path, 'wb') as f:
+            f.write(out)
+
+
+def make_table(number: int, rows: int, cols: int, rng: random.Random, fill=1.0, col_spans=0, row_spans=0) -> dict:
+    """
+    Content of one table: a header row and `rows` body rows.
+
+    Args:
+        fill: Fraction of body cells that get text (the others stay empty)
+        col_spans: Number of body cells spanning two columns
+        row_spans: Number of body cells spanning two rows
+
+    Returns:
+        dict with 'number', 'name', 'header', 'rows' (text per row and column,
+        a spanned position repeats the text of its cell) and 'spans'
+        ({(row, col): (row_count, col_count)} for body cells covering more than one position)
+    """
+    name = f"Pin definitions group {number}"
+    header = [f"Col {col}" for col in range(cols)]
+    body = [[f"T{number}R{row}C{col}" if rng.random() < fill else "" for col in range(cols)] for row in range(rows)]
+    spans = {}
+    covered = set()
+    candidates = [(row, col) for row in range(rows) for col in range(cols)]
+    rng.shuffle(candidates)
+    wanted = [(1, 2)] * col_spans + [(2, 1)] * row_spans
+    for row_count, col_count in wanted:
+        for row, col in candidates:
+            cells = {(row + dr, col + dc) for dr in range(row_count) for dc in range(col_count)}
+            if row + row_count > rows or col + col_count > cols or cells & covered:
+                continue
+            covered |= cells
+            spans[(row, col)] = (row_count, col_count)
+            text = body[row][col] or f"T{number}R{row}C{col}"
+            for r, c in cells:
+                body[r][c] = text
+            break
+    return {'number': number, 'name': name, 'header': header, 'rows': body, 'spans': spans}
+
+
+def _draw_table(pdf: PdfWriter, table: dict, row_ids: List[int], top: float, caption: str,
+                cell_width: float, row_height: float):
+    """Draw the header and the body rows `row_ids` of a table with its top ruling at `top`"""
+    cols = len(table['header'])
+    left = MARGIN
+    pdf.text(left, top - CAPTION_GAP, caption, size=8)
+
+    lines = [table['header']] + [table['rows'][row] for row in row_ids]
+    # Body position -> top-left position of the spanned cell covering it
+    owner = {}
+    for (span_row, span_col), (row_count, col_count) in table['spans'].items():
+        for r in range(span_row, span_row + row_count):
+            for c in range(span_col, span_col + col_count):
+                owner[(r, c)] = (span_row, span_col)
+
+    def same_cell(a, b):
+        return a in owner and owner.get(b) == owner[a]
+
+    bottom = top + len(lines) * row_height
+    pdf.line(left, top, left + cols * cell_width, top)
+    pdf.line(left, top, left, bottom)
+    for index, values in enumerate(lines):
+        y_top = top + index * row_height
+        y_bottom = y_top + row_height
+        for col, value in enumerate(values):
+            x_left = left + col * cell_width
+            x_right = x_left + cell_width
+            position = (row_ids[index - 1], col) if index else None
+            below = (row_ids[index - 1] + 1, col) if index and index < len(row_ids) else None
+            if not (position and same_cell(position, (position[0], col + 1))):
+                pdf.line(x_right, y_top, x_right, y_bottom)
+            if not (below and same_cell(position, below)):
+                pdf.line(x_left, y_bottom, x_right, y_bottom)
+            if value and not (position in owner and owner[position] != position):
+                pdf.text(x_left + 2, y_bottom - 3, value)
+    return bottom
+
+
+def generate(path: str, tables: List[dict], cell_width=60.0, row_height=12.0) -> Dict[str, List[List[str]]]:
+    """
+    Lay out `tables` (from make_table) top to bottom over as many pages as
+    needed and write the PDF to `path`.
+
+    Returns:
+        {table title: expected CSV rows}, the title being the caption without "Table N."
+    """
+    pdf = PdfWriter()
+    pdf.new_page()
+    top = MARGIN + CAPTION_GAP
+    tables_on_page = 0
+    expected = {}
+    for table in tables:
+        caption = f"Table {table['number']}. {table['name']}"
+        expected[table['name']] = [table['header']] + table['rows']
+        # Rows covered by the same row-spanning cell are never split by a page break
+        groups = []
+        for row in range(len(table['rows'])):
+            if groups and any(span_row < row < span_row + row_count
+                              for (span_row, _), (row_count, _) in table['spans'].items()):
+                groups[-1].append(row)
+            else:
+                groups.append([row])
+
+        continued = False
+        while groups:
+            available = int((PAGE_HEIGHT - MARGIN - top) // row_height) - 1  # minus the header row
+            part = []
+            if tables_on_page < MAX_TABLES_PER_PAGE:
+                while groups and len(part) + len(groups[0]) <= available:
+                    part += groups.pop(0)
+            if part:
+                title = caption + (" (continued)" if continued else "")
+                top = _draw_table(pdf, table, part, top, title, cell_width, row_height) + TABLE_GAP
+                tables_on_page += 1
+                continued = True
+            if groups:
+                if not part and tables_on_page == 0:
+                    raise ValueError("A row group of the table is taller than a page")
+                pdf.new_page()
+                top = MARGIN + CAPTION_GAP
+                tables_on_page = 0
+    pdf.save(path)
+    return expected
@@ -0,0 +1,48 @@
+from app.core.py_pdf_stm.TableExtractor import Line, Point, TableExtractor
+
+
+def _horizontal(x1, x2, y=10):
+    return Line(Point(x1, y), Point(x2, y))
+
+
+def _vertical(y1, y2, x=10):
+    return Line(Point(x, y1), Point(x, y2))
+
+
+def _spans(lines):
+    return sorted(line.span for line in lines)
+
+
+def test_touching_segments_are_merged():
+    assert _spans(TableExtractor.merge_collinear([_horizontal(50, 100), _horizontal(0, 50)])) == [(0, 100)]
+
+
+def test_overlapping_segments_are_merged():
+    assert _spans(TableExtractor.merge_collinear([_horizontal(0, 60), _horizontal(40, 100)])) == [(0, 100)]
+    assert _spans(TableExtractor.merge_collinear([_horizontal(0, 100), _horizontal(20, 30)])) == [(0, 100)]
+
+
+def test_segments_within_precision_are_merged():
+    assert _spans(TableExtractor.merge_collinear([_vertical(0, 50), _vertical(53, 100)])) == [(0, 100)]
+    assert _spans(TableExtractor.merge_collinear([_vertical(0, 50), _vertical(54, 100)])) == [(0, 50), (54, 100)]
+
+
+def test_disjoint_segments_are_kept():
+    assert _spans(TableExtractor.merge_collinear([_horizontal(60, 100), _horizontal(0, 40)])) == [(0, 40), (60, 100)]
+
+
+def test_several_segments_on_one_axis():
+    segments = [_horizontal(200, 220), _horizontal(20, 40), _horizontal(75, 100), _horizontal(0, 20),
+                _horizontal(60, 80)]
+    merged = TableExtractor.merge_collinear(segments)
+    assert _spans(merged) == [(0, 40), (60, 100), (200, 220)]
+    assert all(not line.vertical and line.y == 10 for line in merged)
+
+
+def test_filter_lines_merges_per_axis_and_drops_duplicates():
+    lines = [_horizontal(0, 50), _horizontal(0, 50), _horizontal(50, 100),
+             _horizontal(0, 100, y=30),
+             _vertical(0, 30, x=0), _vertical(0, 30, x=100), _vertical(0, 30, x=100)]
+    filtered = TableExtractor.filter_lines(lines)
+    assert sorted(line.key for line in filtered) == [(0, 0, 0, 30), (0, 10, 100, 10), (0, 30, 100, 30),
+                                                    (100, 0, 100, 30)]
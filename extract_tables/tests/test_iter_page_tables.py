@@ -0,0 +1,35 @@
+import random
+
+from app.core.py_pdf_stm import TableExtractor as table_extractor
+from app.core.py_pdf_stm.TableExtractor import TableExtractor, iter_page_tables
+from benchmarks.synthetic_pdf import generate, make_table
+
+
+def _texts(parsed_page):
+    """Title and global_map text of every table on a parsed page"""
+    texts = []
+    for description in parsed_page['tables']:
+        table = description['table']
+        title = description['title_info'] and description['title_info']['full_title']
+        texts.append((title, [[table.global_map[y][x].text.strip() for x in sorted(table.global_map[y])]
+                              for y in sorted(table.global_map)]))
+    return texts
+
+
+def test_worker_pages_match_sequential_parsing(tmp_path, monkeypatch):
+    rng = random.Random(3)
+    path = str(tmp_path / "tables.pdf")
+    generate(path, [make_table(number, rows=rng.randint(8, 40), cols=rng.randint(2, 6), rng=rng, fill=0.8,
+                               col_spans=2, row_spans=1) for number in range(1, 9)])
+    extractor = TableExtractor(path)
+    pages = list(range(len(extractor.pdf.pages)))
+    assert len(pages) > 2
+
+    sequential = [(index, _texts(parsed)) for index, parsed in iter_page_tables(path, extractor, pages)]
+    # One page in flight per worker, so the pool has to refill while pages are consumed
+    monkeypatch.setattr(table_extractor, 'PAGES_IN_FLIGHT_PER_WORKER', 1)
+    parallel = [(index, _texts(parsed)) for index, parsed in iter_page_tables(path, extractor, pages, workers=2)]
+
+    assert [index for index, _ in parallel] == pages
+    assert parallel == sequential
+    assert any(tables for _, tables in sequential)
@@ -0,0 +1,82 @@
+import asyncio
+import importlib
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.job_queue import DONE, RUNNING, JobQueue
+
+
+def _blocking_job(started: threading.Event, release: threading.Event):
+    def run(progress):
+        started.set()
+        release.wait(10)
+        progress(pages_done=1)
+        return {'ok': True}
+    return run
+
+
+def test_running_job_is_not_forgotten():
+    finished = []
+    queue = JobQueue(on_finish=finished.append)
+    started, release = threading.Event(), threading.Event()
+    queue.submit('job', _blocking_job(started, release))
+    assert started.wait(5)
+
+    assert queue.forget('job') is False
+    assert queue.get('job')['status'] == RUNNING
+
+    release.set()
+    job = asyncio.run(queue.wait('job'))
+    assert job['status'] == DONE
+    assert job['progress'] == {'pages_done': 1}
+    assert [entry['job_id'] for entry in finished] == ['job']
+    assert queue.forget('job') is True
+    assert queue.get('job') is None
+
+
+def test_wait_returns_the_final_job_after_eviction():
+    queue = JobQueue(retention=0)
+    queue.submit('job', lambda progress: 42)
+
+    job = asyncio.run(queue.wait('job'))
+
+    assert job['status'] == DONE and job['result'] == 42
+    queue.submit('other', lambda progress: None)  # evicts 'job'
+    assert queue.get('job') is None
+    with pytest.raises(KeyError):
+        asyncio.run(queue.wait('unknown'))
+
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    """pdf_extractor with its upload, output and registry paths in a temporary directory"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('RESULT_CACHE_MAX_MB', '0')
+    import app.api.pdf_extractor as module
+    return importlib.reload(module)
+
+
+def test_delete_while_running_is_rejected(api):
+    started, release = threading.Event(), threading.Event()
+    job_dir = api.OUTPUT_FOLDER / 'job'
+    job_dir.mkdir()
+    api.job_registry.add('job', 'queued', filename='a.pdf')
+    api.job_queue.submit('job', _blocking_job(started, release))
+    assert started.wait(5)
+
+    with pytest.raises(HTTPException) as rejected:
+        asyncio.run(api.delete_job('job'))
+    assert rejected.value.status_code == 409
+    assert job_dir.exists()
+
+    release.set()
+    job = asyncio.run(api.job_queue.wait('job'))
+    assert job['status'] == DONE
+    assert api.job_registry.get('job')['status'] == DONE
+
+    assert asyncio.run(api.delete_job('job'))['success']
+    assert not job_dir.exists()
+    assert api.job_registry.get('job') is None
+    assert api.job_queue.get('job') is None
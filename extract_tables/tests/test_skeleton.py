@@ -0,0 +1,190 @@
+"""
+Table geometry on small fixed grids. The expected skeletons and global_maps
+were produced by the original list-scanning build_skeleton,
+skeleton_to_2d_table and Table.build_table from the same filtered lines; the
+indexed and vectorized helpers are checked against the scans they replace.
+"""
+import pickle
+import random
+
+import numpy as np
+import pytest
+
+from app.core.py_pdf_stm.TableExtractor import (Cell, Line, Point, PointGrid, Table, TableExtractor, cell_rects,
+                                                points_in_rects)
+
+# Cell rectangles (x1, y1, x2, y2) as TableFinder reports them
+SPAN = [(50, 50, 130, 70), (130, 50, 170, 70), (50, 70, 90, 90), (90, 70, 130, 90), (130, 70, 170, 110),
+        (50, 90, 90, 110), (90, 90, 130, 110)]
+JITTER = [(50.4, 49.2, 91.7, 70.3), (91.1, 50.8, 130.2, 69.6), (130.9, 49.5, 170.3, 70.8),
+          (49.6, 70.1, 90.8, 89.4), (90.3, 69.2, 129.7, 90.6), (129.5, 70.4, 171.2, 89.9),
+          (50.7, 90.2, 91.4, 110.5), (91.6, 89.7, 130.6, 109.3), (130.1, 90.8, 169.8, 110.1)]
+# Rows and columns 4 to 6 units apart, around the 5 unit almost_equals tolerance
+TINY = [(50, 50, 56, 56), (56, 50, 60, 56), (60, 50, 100, 56), (50, 56, 56, 60), (56, 56, 60, 60),
+        (60, 56, 100, 60), (50, 60, 56, 80), (56, 60, 100, 80)]
+
+EXPECTED = {
+    'span': (
+        SPAN,
+        [(50, 50), (50, 70), (50, 90), (50, 110), (90, 50), (90, 70), (90, 90), (90, 110), (130, 50), (130, 70),
+         (130, 90), (130, 110), (170, 50), (170, 70), (170, 90), (170, 110)],
+        [[((50, 50), (90, 70)), ((90, 50), (130, 70)), ((130, 50), (170, 70))],
+         [((50, 70), (90, 90)), ((90, 70), (130, 90)), ((130, 70), (170, 90))],
+         [((50, 90), (90, 110)), ((90, 90), (130, 110)), ((130, 90), (170, 110))]],
+        [[0, 0, 1], [2, 3, 4], [5, 6, 4]],
+    ),
+    'jitter': (
+        JITTER,
+        [(50, 51), (50, 70), (50, 71), (50, 90), (50, 91), (50, 110), (51, 50), (51, 91), (51, 111), (91, 51),
+         (91, 70), (91, 91), (91, 110), (92, 50), (92, 51), (92, 71), (92, 110), (92, 111), (130, 51), (130, 70),
+         (130, 71), (130, 91), (130, 110), (131, 50), (131, 51), (131, 70), (131, 110), (131, 111), (170, 51),
+         (170, 70), (170, 91), (170, 110)],
+        [[((51, 50), (91, 70)), ((92, 50), (131, 70)), ((131, 50), (170, 70))],
+         [((50, 70), (91, 91)), ((91, 70), (130, 91)), ((131, 70), (170, 91))],
+         [((50, 90), (91, 110))],
+         [((91, 91), (131, 110)), ((130, 91), (170, 110))]],
+        [[0, 1, 2], [3, 4, 5], [6], [7, 8]],
+    ),
+    'tiny': (
+        TINY,
+        [(50, 50), (50, 56), (50, 60), (50, 80), (56, 50), (56, 56), (60, 50), (60, 56), (60, 60), (60, 80),
+         (100, 50), (100, 60), (100, 80)],
+        [[((50, 50), (60, 56)), ((60, 50), (100, 60))],
+         [((50, 56), (60, 80)), ((60, 56), (100, 80))]],
+        [[0, 2], [6, 7]],
+    ),
+}
+
+
+def cells_and_lines(rects):
+    """Cells and edge lines of the rectangles, built like TableExtractor.parse_page does"""
+    cells, lines = [], []
+    for x1, y1, x2, y2 in rects:
+        p1 = Point(x1, y1)
+        p1.right = p1.down = True
+        p2 = Point(x2, y1)
+        p2.left = p2.down = True
+        p3 = Point(x2, y2)
+        p3.up = p3.left = True
+        p4 = Point(x1, y2)
+        p4.up = p4.right = True
+        lines += [Line(p1, p2), Line(p2, p3), Line(p3, p4), Line(p4, p1)]
+        cells.append(Cell(p1, p2, p3, p4))
+    return cells, lines
+
+
+def extract(rects):
+    """Skeleton points, skeleton rows and the filled Table of the rectangles"""
+    cells, lines = cells_and_lines(rects)
+    extractor = TableExtractor.__new__(TableExtractor)
+    points, skeleton = extractor.build_skeleton(TableExtractor.filter_lines(lines))
+    rows = TableExtractor.skeleton_to_2d_table(skeleton)
+    ugly_table = [['{}.{}'.format(y, x) for x in range(len(row))] for y, row in enumerate(rows)]
+    table = Table(cells, rows, ugly_table, [])
+    table.build_table()
+    return points, rows, table
+
+
+def global_map_indices(table):
+    """global_map as rows of indices into table.cells"""
+    return [[next(i for i, cell in enumerate(table.cells) if cell is table.global_map[y][x])
+             for x in sorted(table.global_map[y])] for y in sorted(table.global_map)]
+
+
+@pytest.mark.parametrize('name', sorted(EXPECTED))
+def test_skeleton_and_global_map_match_the_previous_implementation(name):
+    rects, points, skeleton, global_map = EXPECTED[name]
+    found_points, rows, table = extract(rects)
+
+    assert sorted(point.as_tuple for point in found_points) == points
+    assert all((p.up, p.down, p.right, p.left) == (True, True, True, True) for p in found_points)
+    assert [[(cell.p1.as_tuple, cell.p3.as_tuple) for cell in row] for row in rows] == skeleton
+    assert global_map_indices(table) == global_map
+
+
+def test_spanned_cell_collects_the_text_of_every_position():
+    _, _, table = extract(SPAN)
+    assert [cell.text for cell in table.cells] == ['0.00.1', '0.2', '1.0', '1.1', '1.22.2', '2.0', '2.1']
+
+
+def test_line_without_intersection_keeps_its_own_directions():
+    # A 4 unit horizontal stub counts as vertical (almost_equals x) but crosses nothing. Its
+    # points are added after the last intersection and are not connected in every direction,
+    # so no cell may end on them.
+    segments = [(50, 50, 50, 90), (90, 50, 90, 90), (130, 50, 130, 90),
+                (50, 50, 130, 50), (50, 70, 130, 70), (50, 90, 130, 90), (130, 90, 134, 90)]
+    lines = [Line(Point(x1, y1), Point(x2, y2)) for x1, y1, x2, y2 in segments]
+    points, skeleton = TableExtractor.__new__(TableExtractor).build_skeleton(lines)
+
+    stub = next(point for point in points if point.as_tuple == (134, 90))
+    assert (stub.up, stub.down, stub.right, stub.left) == (False, True, False, False)
+    assert sorted((cell.p1.as_tuple, cell.p3.as_tuple) for cell in skeleton) == [
+        ((50, 50), (90, 70)), ((50, 70), (90, 90)), ((90, 50), (130, 70)), ((90, 70), (130, 90))]
+
+
+@pytest.mark.parametrize('rects', [SPAN, JITTER, TINY])
+def test_point_grid_matches_the_list_scans(rects):
+    rng = random.Random(len(rects))
+    cells, _ = cells_and_lines(rects)
+    points = [point for cell in cells for point in (cell.p1, cell.p2, cell.p3, cell.p4)]
+    for point in points:
+        point.up, point.down, point.right, point.left = (rng.random() < 0.7 for _ in range(4))
+    grid = PointGrid(points)
+
+    for point in points:
+        assert grid.get_right(point) is point.get_right(points)
+        for left, right in ((False, False), (True, False), (False, True)):
+            assert grid.get_bottom(point, left=left, right=right) is point.get_bottom(points, left=left, right=right)
+
+
+def test_skeleton_to_2d_table_sorts_rows_and_columns():
+    _, rows, _ = extract(JITTER)
+    cells = [cell for row in rows for cell in row]
+    random.Random(1).shuffle(cells)
+
+    regrouped = TableExtractor.skeleton_to_2d_table(cells)
+    assert [[cell.as_tuple for cell in row] for row in regrouped] == [[cell.as_tuple for cell in row] for row in rows]
+
+
+@pytest.mark.parametrize('rects', [SPAN, JITTER, TINY])
+def test_points_in_rects_matches_point_inside_polygon(rects):
+    cells, _ = cells_and_lines(rects)
+    # Every integer position around the grid, edges included
+    points = [(x, y) for x in range(45, 176) for y in range(45, 116)]
+
+    inside = points_in_rects(np.array(points, dtype=float), cell_rects(cells))
+
+    assert inside.shape == (len(points), len(cells))
+    for (x, y), row in zip(points, inside):
+        assert list(row) == [cell.point_inside_polygon(Point(x, y)) for cell in cells]
+
+
+def test_words_are_assigned_to_the_cell_around_their_origin():
+    words = [{'x0': 60.2, 'top': 55.0, 'text': 'a'},  # spanned first cell
+             {'x0': 140.0, 'top': 100.0, 'text': 'b'},  # row spanning cell
+             {'x0': 90.0, 'top': 80.0, 'text': 'edge'},  # on a ruling: no cell
+             {'x0': 200.0, 'top': 80.0, 'text': 'outside'}]
+    _, rows, _ = extract(SPAN)
+    cells, _ = cells_and_lines(SPAN + [SPAN[0]])
+    table = Table(cells, rows, [[''] * len(row) for row in rows], words)
+    table.build_table()
+
+    assert [[word['text'] for word in cell.words] for cell in table.cells] == [['a'], [], [], [], ['b'], [], [], []]
+
+
+def test_slotted_objects_round_trip_through_pickle():
+    cells, lines = cells_and_lines(SPAN)
+    cell, line = cells[0], lines[0]
+    cell.text = 'text'
+    for obj in (cell, line, cell.p1):
+        assert not hasattr(obj, '__dict__')
+        with pytest.raises(AttributeError):
+            obj.unknown = True
+
+    copy = pickle.loads(pickle.dumps(cell))
+    assert copy.as_tuple == cell.as_tuple and copy.text == 'text' and copy.words == []
+    assert (copy.p1.right, copy.p1.down, copy.p1.up) == (True, True, False)
+    assert hash(copy.p1) == hash(cell.p1)
+    line_copy = pickle.loads(pickle.dumps(line))
+    assert line_copy.as_tuple == line.as_tuple and line_copy.vertical == line.vertical
+    assert hash(line_copy) == hash(line)